@@ -1,9 +1,11 @@
+import atexit
+import itertools
 import math
+import os
 import tkinter as tk
+from tkinter import filedialog
 from tkinter import messagebox
 from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 class FluxoOilCalculator:
     def __init__(
@@ -99,6 +101,32 @@ poços = []
 # Lista global para armazenar resultados do IP e II (aba Produtividade/Injetabilidade)
 i_pocos = []
 
+# Diário somente-anexação das ações (ver diario.py), para auditar e
+# reconstruir rankings de qualquer instante da sessão. É aberto na primeira
+# ação registrada, fora do caminho até a primeira janela; a variável de
+# ambiente CALCULADORA_DIARIO troca o diretório (benchmarks, testes).
+DIRETORIO_DIARIO = os.environ.get("CALCULADORA_DIARIO") or os.path.join(
+    os.path.expanduser("~"), ".calculadora_completacao", "diario"
+)
+diario_calculos = None
+diario_desativado = False
+
+def registrar_no_diario(op, dados=None):
+    global diario_calculos, diario_desativado
+    if diario_desativado:
+        return
+    try:
+        if diario_calculos is None:
+            import diario
+            diario_calculos = diario.DiarioCalculos(DIRETORIO_DIARIO)
+            atexit.register(diario_calculos.fechar)
+            diario_calculos.registrar("inicio_sessao")
+        diario_calculos.registrar(op, dados)
+    except Exception as e:
+        # Um diário ilegível ou sem espaço em disco não impede os cálculos
+        diario_desativado = True
+        messagebox.showwarning("Diário", f"Diário de cálculos desativado nesta sessão: {e}")
+
 def adicionar_poco():
     try:
         nome = entry_nome.get()
@@ -142,6 +170,7 @@ def adicionar_poco():
             "rd": rd,
             "k": kd
         })
+        registrar_no_diario("adicionar_poco", poços[-1])
         label_result.config(text=f"Poço '{nome}': Fluxo = {resultado:.4f} | Fluxo usando S = {resultado_S:.4f} | Skin = {skin_result:.4f} | Queda de pressão = {delta_p:.4f} | Eficiência = {eficiencia:.4f}")
         limpar_entradas()
     except Exception as e:
@@ -188,6 +217,7 @@ def atualizar_ranking():
 
 def limpar_ranking():
     poços.clear()
+    registrar_no_diario("limpar_ranking")
     atualizar_ranking()
 
 def apagar_poco():
@@ -200,6 +230,7 @@ def apagar_poco():
         nome_poco = values[1]
         global poços
         poços = [p for p in poços if p["nome"] != nome_poco]
+        registrar_no_diario("apagar_poco", {"nome": nome_poco})
     atualizar_ranking()
 
 # Funções para a aba Produtividade/Injetabilidade (IP e II)
@@ -222,7 +253,8 @@ def adicionar_poco_ip():
         )
         ip = calculadora.calcular_ip(Pe, pwf)
         ii = calculadora.calcular_ii(Pe, pwf)
-        i_pocos.append({"nome": nome, "ip": ip, "ii": ii, "pwf": pwf})
+        i_pocos.append({"nome": nome, "ip": ip, "ii": ii, "pwf": pwf, "q1": q1, "Pe": Pe, "psat": psat})
+        registrar_no_diario("adicionar_poco_ip", i_pocos[-1])
         label_ip_result.config(text=f"IP = {ip:.4f} | II = {ii:.4f} | pwf = {pwf:.4f}")
         atualizar_ranking_ip()
         limpar_campos_ip()
@@ -257,6 +289,7 @@ def limpar_campos_ip():
 
 def limpar_ranking_ip():
     i_pocos.clear()
+    registrar_no_diario("limpar_ranking_ip")
     atualizar_ranking_ip()
 
 def apagar_poco_ip():
@@ -269,10 +302,13 @@ def apagar_poco_ip():
         nome_poco = values[1]
         global i_pocos
         i_pocos = [p for p in i_pocos if p["nome"] != nome_poco]
+        registrar_no_diario("apagar_poco_ip", {"nome": nome_poco})
     atualizar_ranking_ip()
 
 # Global list para armazenar os resultados do canhoneamento para o ranking
 ranking_canh = []
+# Identificador de cada cálculo de canhoneamento na sessão (C1, C2, ...)
+contador_canh = itertools.count(1)
 
 def calcular_deltaP_canh(k: float, phasing: float) -> float:
     if phasing == 0:
@@ -351,8 +387,16 @@ def processar_canhoneamento():
         Sx = calcular_Sx(rd, rw, lp)
         Sdp = calcular_Sdp(Sp, Sx)
         
-        # Armazenar os resultados no ranking global para canhoneamento
+        # Armazenar os resultados (com as entradas) no ranking global para canhoneamento
         resultado = {
+            "id": f"C{next(contador_canh)}",
+            "k": k,
+            "rw": rw,
+            "lp": lp,
+            "rp": rp,
+            "phasing": phasing,
+            "h": h_canh,
+            "rd": rd,
             "deltaP": deltaP,
             "hd": hd,
             "rpd": rpd,
@@ -367,6 +411,7 @@ def processar_canhoneamento():
             "b": b
         }
         ranking_canh.append(resultado)
+        registrar_no_diario("processar_canhoneamento", resultado)
         
         # Se não existir um container para o ranking, cria-o
         if not hasattr(processar_canhoneamento, "container"):
@@ -412,7 +457,11 @@ def processar_canhoneamento():
 
 app = tk.Tk()
 app.title("Calculadora para completação de poços de petróleo")
-app.state("zoomed")
+try:
+    app.state("zoomed")
+except tk.TclError:
+    # "zoomed" só existe no Windows; no X11 o equivalente é o atributo -zoomed
+    app.attributes("-zoomed", True)
 
 # Cabeçalho moderno com títulos, autor e professor
 style = ttk.Style(app)
@@ -468,6 +517,10 @@ notebook.add(tab_prod_inj, text="Índice de Produtividade e Injetabilidade")
 tab_canhoneamento = ttk.Frame(notebook, padding="20")
 notebook.add(tab_canhoneamento, text="Canhoneamento")
 
+# Aba do Painel do Campo
+tab_painel = ttk.Frame(notebook, padding="20")
+notebook.add(tab_painel, text="Painel do Campo")
+
 # Aplicando tema moderno usando ttk nos widgets
 style = ttk.Style(app)
 style.theme_use('clam')
@@ -476,45 +529,6 @@ style.configure('TEntry', padding=5)
 style.configure('TButton', font=("Segoe UI", 10, "bold"), padding=5)
 
 # ------------------- Aba Eficiência de Fluxo e Queda de pressão -------------------
-mainframe = tab_efficiencia
-mainframe.columnconfigure(0, weight=1)
-mainframe.columnconfigure(1, weight=1)
-
-lbl_info = ttk.Label(mainframe, text="Informe os valores:")
-lbl_info.grid(row=0, column=0, columnspan=2, pady=(10, 10), sticky="w")
-
-# Campo para o nome do poço
-label_nome = ttk.Label(mainframe, text="Nome do poço:")
-label_nome.grid(row=1, column=0, padx=10, pady=5, sticky="w")
-entry_nome = ttk.Entry(mainframe)
-entry_nome.grid(row=1, column=1, padx=10, pady=5, sticky="w")
-
-labels_text = [
-    "ko (Fator de permeabilidade do óleo):",
-    "h (Altura):",
-    "pr (pressão média do reservatório):",
-    "pw (pressão de fluxo do poço):",
-    "uo (Viscosidade do óleo):",
-    "Bo (Fator de volume de formação):",
-    "re (Área de drenagem efetiva do poço):",
-    "rw (Raio do poço):",
-    "L (Comprimento da secção):",
-    "A (Área em corte transversal):",
-    "rd (adicionando ft):",
-    "kd (Permeabilidade da zona danificada até uma distância rd):"
-]
-entries = []
-for i, text in enumerate(labels_text):
-    label = ttk.Label(mainframe, text=text)
-    label.grid(row=i+2, column=0, padx=10, pady=5, sticky="w")
-    entry = ttk.Entry(mainframe)
-    entry.grid(row=i+2, column=1, padx=10, pady=5, sticky="w")
-    entries.append(entry)
-
-(entry_ko, entry_h, entry_pr, entry_pw, entry_uo,
- entry_Bo, entry_re, entry_rw, entry_L, entry_A,
- entry_rd, entry_k) = entries
-
 tooltip = None
 def show_tooltip(event, text):
     global tooltip
@@ -534,87 +548,6 @@ def hide_tooltip(event):
         tooltip.destroy()
         tooltip = None
 
-entry_ko.bind("<Enter>", lambda e: show_tooltip(e, "md"))
-entry_ko.bind("<Leave>", hide_tooltip)
-
-entry_h.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
-entry_h.bind("<Leave>", hide_tooltip)
-
-entry_uo.bind("<Enter>", lambda e: show_tooltip(e, "cp"))
-entry_uo.bind("<Leave>", hide_tooltip)
-
-entry_pw.bind("<Enter>", lambda e: show_tooltip(e, "psi"))
-entry_pw.bind("<Leave>", hide_tooltip)
-
-entry_pr.bind("<Enter>", lambda e: show_tooltip(e, "psi"))
-entry_pr.bind("<Leave>", hide_tooltip)
-
-entry_re.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
-entry_re.bind("<Leave>", hide_tooltip)
-
-entry_rw.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
-entry_rw.bind("<Leave>", hide_tooltip)
-
-entry_Bo.bind("<Enter>", lambda e: show_tooltip(e, "SSP"))
-entry_Bo.bind("<Leave>", hide_tooltip)
-
-entry_L.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
-entry_L.bind("<Leave>", hide_tooltip)
-
-entry_A.bind("<Enter>", lambda e: show_tooltip(e, "ft²"))
-entry_A.bind("<Leave>", hide_tooltip)
-
-entry_rd.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
-entry_rd.bind("<Leave>", hide_tooltip)
-
-entry_k.bind("<Enter>", lambda e: show_tooltip(e, "md"))
-entry_k.bind("<Leave>", hide_tooltip)
-
-btn_adicionar = ttk.Button(mainframe, text="Adicionar resultado do Poço", command=adicionar_poco)
-btn_adicionar.grid(row=len(labels_text)+2, column=0, columnspan=2, pady=5)
-
-btn_ranking = ttk.Button(mainframe, text="Exibir Ranking", command=lambda: atualizar_ranking())
-btn_ranking.grid(row=len(labels_text)+3, column=0, columnspan=2, pady=5)
-
-label_result = ttk.Label(mainframe, text="", font=("Segoe UI", 10, "bold"))
-label_result.grid(row=len(labels_text)+4, column=0, columnspan=2, pady=(5, 10), sticky="w")
-
-# Frame para exibir o ranking dentro da aba
-ranking_frame = ttk.Frame(mainframe, padding="20", relief="sunken")
-ranking_frame.grid(row=0, column=2, rowspan=10, padx=20, pady=5, sticky="nw")
-
-ranking_title = ttk.Label(ranking_frame, text="Ranking dos Poços", font=("Segoe UI", 12, "bold"))
-ranking_title.grid(row=0, column=0, columnspan=3, pady=(0,10), sticky="w")
-
-ranking_tree = ttk.Treeview(
-    ranking_frame,
-    columns=("pos", "nome", "fluxo", "skin", "fluxo_S", "deltaP", "Eficiência(FE)"),
-    show="headings",
-    height=10
-)
-ranking_tree.heading("pos", text="Posição", anchor="w")
-ranking_tree.heading("nome", text="Nome do Poço", anchor="w")
-ranking_tree.heading("fluxo", text="Fluxo", anchor="w")
-ranking_tree.heading("skin", text="Skin factor(S)", anchor="w")
-ranking_tree.heading("fluxo_S", text="Fluxo usando (S)", anchor="w")
-ranking_tree.heading("deltaP", text="Queda de pressão(deltaP)", anchor="w")
-ranking_tree.heading("Eficiência(FE)", text="Eficiência (FE)", anchor="w")
-ranking_tree.column("pos", width=60, anchor="w")
-ranking_tree.column("nome", width=150, anchor="w")
-ranking_tree.column("fluxo", width=100, anchor="w")
-ranking_tree.column("skin", width=100, anchor="w")
-ranking_tree.column("fluxo_S", width=100, anchor="w")
-ranking_tree.column("deltaP", width=150, anchor="w")
-ranking_tree.column("Eficiência(FE)", width=100, anchor="w")
-ranking_tree.grid(row=1, column=0, columnspan=2, sticky="w")
-
-scrollbar = ttk.Scrollbar(ranking_frame, orient="vertical", command=ranking_tree.yview)
-ranking_tree.configure(yscroll=scrollbar.set)
-scrollbar.grid(row=1, column=2, sticky="ns")
-
-btn_limpar = ttk.Button(ranking_frame, text="Limpar Ranking", command=limpar_ranking)
-btn_limpar.grid(row=2, column=0, columnspan=3, pady=5, sticky="w")
-
 def apagar_poco():
     selected = ranking_tree.selection()
     if not selected:
@@ -625,46 +558,137 @@ def apagar_poco():
         nome_poco = values[1]
         global poços
         poços = [p for p in poços if p["nome"] != nome_poco]
+        registrar_no_diario("apagar_poco", {"nome": nome_poco})
     atualizar_ranking()
 
-btn_apagar = ttk.Button(ranking_frame, text="Apagar Poço", command=apagar_poco)
-btn_apagar.grid(row=3, column=0, columnspan=3, pady=5, sticky="w")
+def construir_aba_eficiencia():
+    global entry_nome, entries, label_result, ranking_tree
+    global entry_ko, entry_h, entry_pr, entry_pw, entry_uo, entry_Bo
+    global entry_re, entry_rw, entry_L, entry_A, entry_rd, entry_k
+    mainframe = tab_efficiencia
+    mainframe.columnconfigure(0, weight=1)
+    mainframe.columnconfigure(1, weight=1)
+
+    lbl_info = ttk.Label(mainframe, text="Informe os valores:")
+    lbl_info.grid(row=0, column=0, columnspan=2, pady=(10, 10), sticky="w")
+
+    # Campo para o nome do poço
+    label_nome = ttk.Label(mainframe, text="Nome do poço:")
+    label_nome.grid(row=1, column=0, padx=10, pady=5, sticky="w")
+    entry_nome = ttk.Entry(mainframe)
+    entry_nome.grid(row=1, column=1, padx=10, pady=5, sticky="w")
+
+    labels_text = [
+        "ko (Fator de permeabilidade do óleo):",
+        "h (Altura):",
+        "pr (pressão média do reservatório):",
+        "pw (pressão de fluxo do poço):",
+        "uo (Viscosidade do óleo):",
+        "Bo (Fator de volume de formação):",
+        "re (Área de drenagem efetiva do poço):",
+        "rw (Raio do poço):",
+        "L (Comprimento da secção):",
+        "A (Área em corte transversal):",
+        "rd (adicionando ft):",
+        "kd (Permeabilidade da zona danificada até uma distância rd):"
+    ]
+    entries = []
+    for i, text in enumerate(labels_text):
+        label = ttk.Label(mainframe, text=text)
+        label.grid(row=i+2, column=0, padx=10, pady=5, sticky="w")
+        entry = ttk.Entry(mainframe)
+        entry.grid(row=i+2, column=1, padx=10, pady=5, sticky="w")
+        entries.append(entry)
+
+    (entry_ko, entry_h, entry_pr, entry_pw, entry_uo,
+     entry_Bo, entry_re, entry_rw, entry_L, entry_A,
+     entry_rd, entry_k) = entries
+
+    entry_ko.bind("<Enter>", lambda e: show_tooltip(e, "md"))
+    entry_ko.bind("<Leave>", hide_tooltip)
+
+    entry_h.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
+    entry_h.bind("<Leave>", hide_tooltip)
+
+    entry_uo.bind("<Enter>", lambda e: show_tooltip(e, "cp"))
+    entry_uo.bind("<Leave>", hide_tooltip)
+
+    entry_pw.bind("<Enter>", lambda e: show_tooltip(e, "psi"))
+    entry_pw.bind("<Leave>", hide_tooltip)
+
+    entry_pr.bind("<Enter>", lambda e: show_tooltip(e, "psi"))
+    entry_pr.bind("<Leave>", hide_tooltip)
+
+    entry_re.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
+    entry_re.bind("<Leave>", hide_tooltip)
+
+    entry_rw.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
+    entry_rw.bind("<Leave>", hide_tooltip)
+
+    entry_Bo.bind("<Enter>", lambda e: show_tooltip(e, "SSP"))
+    entry_Bo.bind("<Leave>", hide_tooltip)
+
+    entry_L.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
+    entry_L.bind("<Leave>", hide_tooltip)
+
+    entry_A.bind("<Enter>", lambda e: show_tooltip(e, "ft²"))
+    entry_A.bind("<Leave>", hide_tooltip)
+
+    entry_rd.bind("<Enter>", lambda e: show_tooltip(e, "ft"))
+    entry_rd.bind("<Leave>", hide_tooltip)
+
+    entry_k.bind("<Enter>", lambda e: show_tooltip(e, "md"))
+    entry_k.bind("<Leave>", hide_tooltip)
+
+    btn_adicionar = ttk.Button(mainframe, text="Adicionar resultado do Poço", command=adicionar_poco)
+    btn_adicionar.grid(row=len(labels_text)+2, column=0, columnspan=2, pady=5)
+
+    btn_ranking = ttk.Button(mainframe, text="Exibir Ranking", command=lambda: atualizar_ranking())
+    btn_ranking.grid(row=len(labels_text)+3, column=0, columnspan=2, pady=5)
+
+    label_result = ttk.Label(mainframe, text="", font=("Segoe UI", 10, "bold"))
+    label_result.grid(row=len(labels_text)+4, column=0, columnspan=2, pady=(5, 10), sticky="w")
+
+    # Frame para exibir o ranking dentro da aba
+    ranking_frame = ttk.Frame(mainframe, padding="20", relief="sunken")
+    ranking_frame.grid(row=0, column=2, rowspan=10, padx=20, pady=5, sticky="nw")
+
+    ranking_title = ttk.Label(ranking_frame, text="Ranking dos Poços", font=("Segoe UI", 12, "bold"))
+    ranking_title.grid(row=0, column=0, columnspan=3, pady=(0,10), sticky="w")
+
+    ranking_tree = ttk.Treeview(
+        ranking_frame,
+        columns=("pos", "nome", "fluxo", "skin", "fluxo_S", "deltaP", "Eficiência(FE)"),
+        show="headings",
+        height=10
+    )
+    ranking_tree.heading("pos", text="Posição", anchor="w")
+    ranking_tree.heading("nome", text="Nome do Poço", anchor="w")
+    ranking_tree.heading("fluxo", text="Fluxo", anchor="w")
+    ranking_tree.heading("skin", text="Skin factor(S)", anchor="w")
+    ranking_tree.heading("fluxo_S", text="Fluxo usando (S)", anchor="w")
+    ranking_tree.heading("deltaP", text="Queda de pressão(deltaP)", anchor="w")
+    ranking_tree.heading("Eficiência(FE)", text="Eficiência (FE)", anchor="w")
+    ranking_tree.column("pos", width=60, anchor="w")
+    ranking_tree.column("nome", width=150, anchor="w")
+    ranking_tree.column("fluxo", width=100, anchor="w")
+    ranking_tree.column("skin", width=100, anchor="w")
+    ranking_tree.column("fluxo_S", width=100, anchor="w")
+    ranking_tree.column("deltaP", width=150, anchor="w")
+    ranking_tree.column("Eficiência(FE)", width=100, anchor="w")
+    ranking_tree.grid(row=1, column=0, columnspan=2, sticky="w")
+
+    scrollbar = ttk.Scrollbar(ranking_frame, orient="vertical", command=ranking_tree.yview)
+    ranking_tree.configure(yscroll=scrollbar.set)
+    scrollbar.grid(row=1, column=2, sticky="ns")
+
+    btn_limpar = ttk.Button(ranking_frame, text="Limpar Ranking", command=limpar_ranking)
+    btn_limpar.grid(row=2, column=0, columnspan=3, pady=5, sticky="w")
+
+    btn_apagar = ttk.Button(ranking_frame, text="Apagar Poço", command=apagar_poco)
+    btn_apagar.grid(row=3, column=0, columnspan=3, pady=5, sticky="w")
 
 # ------------------- Aba Índice de Produtividade e Injetabilidade -------------------
-lbl_info_prod = ttk.Label(tab_prod_inj, text="Informe os valores para o Índice de Produtividade:")
-lbl_info_prod.grid(row=0, column=0, columnspan=2, padx=10, pady=10, sticky="w")
-
-label_nome_ip = ttk.Label(tab_prod_inj, text="Nome do Poço:")
-label_nome_ip.grid(row=1, column=0, padx=10, pady=5, sticky="w")
-entry_nome_ip = ttk.Entry(tab_prod_inj)
-entry_nome_ip.grid(row=1, column=1, padx=10, pady=5, sticky="w")
-
-label_qo = ttk.Label(tab_prod_inj, text="Fluxo (q1):")
-label_qo.grid(row=2, column=0, padx=10, pady=5, sticky="w")
-entry_q1_prod = ttk.Entry(tab_prod_inj)
-entry_q1_prod.grid(row=2, column=1, padx=10, pady=5, sticky="w")
-
-label_Pe = ttk.Label(tab_prod_inj, text="Pe (psi):")
-label_Pe.grid(row=3, column=0, padx=10, pady=5, sticky="w")
-entry_Pe = ttk.Entry(tab_prod_inj)
-entry_Pe.grid(row=3, column=1, padx=10, pady=5, sticky="w")
-
-label_pwf = ttk.Label(tab_prod_inj, text="pwf (psi):")
-label_pwf.grid(row=4, column=0, padx=10, pady=5, sticky="w")
-entry_pwf = ttk.Entry(tab_prod_inj)
-entry_pwf.grid(row=4, column=1, padx=10, pady=5, sticky="w")
-
-label_Psat = ttk.Label(tab_prod_inj, text="Psat (psi):")
-label_Psat.grid(row=5, column=0, padx=10, pady=5, sticky="w")
-entry_Psat = ttk.Entry(tab_prod_inj)
-entry_Psat.grid(row=5, column=1, padx=10, pady=5, sticky="w")
-
-btn_calcular_ip = ttk.Button(tab_prod_inj, text="Calcular IP/II", command=adicionar_poco_ip)
-btn_calcular_ip.grid(row=6, column=0, columnspan=2, padx=10, pady=10)
-
-label_ip_result = ttk.Label(tab_prod_inj, text="", font=("Segoe UI", 10, "bold"))
-label_ip_result.grid(row=8, column=0, columnspan=2, padx=10, pady=10, sticky="w")
-
 def representar_curva_ipr():
     try:
         Pe = float(entry_Pe.get())
@@ -677,7 +701,11 @@ def representar_curva_ipr():
         ii = calculadora.calcular_ii(Pe, pwf)
         pwf_values = [i for i in range(int(pwf), int(Pe) + 1)]
         qo_values = [ii * (Pe - p) for p in pwf_values]
-        
+
+        # Matplotlib só é carregado no primeiro gráfico
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
         fig, ax = plt.subplots()
         ax.plot(pwf_values, qo_values, label="Curva IPR (usando II)")
         ax.set_xlabel("pwf (psi)")
@@ -691,74 +719,79 @@ def representar_curva_ipr():
     except Exception as e:
         messagebox.showerror("Erro", f"Erro ao representar a curva IPR: {e}")
 
-btn_representar_ipr = ttk.Button(tab_prod_inj, text="Representar Curva IPR", command=representar_curva_ipr)
-btn_representar_ipr.grid(row=9, column=0, columnspan=2, padx=10, pady=10)
-
-ranking_frame_ip = ttk.Frame(tab_prod_inj, padding="20", relief="sunken")
-ranking_frame_ip.grid(row=0, column=2, rowspan=9, padx=20, pady=5, sticky="nw")
-
-ranking_title_ip = ttk.Label(ranking_frame_ip, text="Ranking dos Poços (IP e II)", font=("Segoe UI", 12, "bold"))
-ranking_title_ip.grid(row=0, column=0, columnspan=3, pady=(0,10), sticky="w")
-
-ranking_tree_ip = ttk.Treeview(
-    ranking_frame_ip,
-    columns=("pos", "nome", "ip", "ii"),
-    show="headings",
-    height=10
-)
-ranking_tree_ip.heading("pos", text="Posição", anchor="w")
-ranking_tree_ip.heading("nome", text="Nome do Poço", anchor="w")
-ranking_tree_ip.heading("ip", text="IP", anchor="w")
-ranking_tree_ip.heading("ii", text="II", anchor="w")
-ranking_tree_ip.column("pos", width=60, anchor="w")
-ranking_tree_ip.column("nome", width=150, anchor="w")
-ranking_tree_ip.column("ip", width=100, anchor="w")
-ranking_tree_ip.column("ii", width=100, anchor="w")
-ranking_tree_ip.grid(row=1, column=0, columnspan=2, sticky="w")
-
-scrollbar_ip = ttk.Scrollbar(ranking_frame_ip, orient="vertical", command=ranking_tree_ip.yview)
-ranking_tree_ip.configure(yscroll=scrollbar_ip.set)
-scrollbar_ip.grid(row=1, column=2, sticky="ns")
-
-btn_limpar_ip = ttk.Button(ranking_frame_ip, text="Limpar Ranking", command=limpar_ranking_ip)
-btn_limpar_ip.grid(row=2, column=0, columnspan=3, pady=5, sticky="w")
-
-btn_apagar_ip = ttk.Button(ranking_frame_ip, text="Apagar Poço", command=apagar_poco_ip)
-btn_apagar_ip.grid(row=3, column=0, columnspan=3, pady=5, sticky="w")
+def construir_aba_produtividade():
+    global entry_nome_ip, entry_q1_prod, entry_Pe, entry_pwf, entry_Psat
+    global label_ip_result, ranking_tree_ip
+    lbl_info_prod = ttk.Label(tab_prod_inj, text="Informe os valores para o Índice de Produtividade:")
+    lbl_info_prod.grid(row=0, column=0, columnspan=2, padx=10, pady=10, sticky="w")
+
+    label_nome_ip = ttk.Label(tab_prod_inj, text="Nome do Poço:")
+    label_nome_ip.grid(row=1, column=0, padx=10, pady=5, sticky="w")
+    entry_nome_ip = ttk.Entry(tab_prod_inj)
+    entry_nome_ip.grid(row=1, column=1, padx=10, pady=5, sticky="w")
+
+    label_qo = ttk.Label(tab_prod_inj, text="Fluxo (q1):")
+    label_qo.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+    entry_q1_prod = ttk.Entry(tab_prod_inj)
+    entry_q1_prod.grid(row=2, column=1, padx=10, pady=5, sticky="w")
+
+    label_Pe = ttk.Label(tab_prod_inj, text="Pe (psi):")
+    label_Pe.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+    entry_Pe = ttk.Entry(tab_prod_inj)
+    entry_Pe.grid(row=3, column=1, padx=10, pady=5, sticky="w")
+
+    label_pwf = ttk.Label(tab_prod_inj, text="pwf (psi):")
+    label_pwf.grid(row=4, column=0, padx=10, pady=5, sticky="w")
+    entry_pwf = ttk.Entry(tab_prod_inj)
+    entry_pwf.grid(row=4, column=1, padx=10, pady=5, sticky="w")
+
+    label_Psat = ttk.Label(tab_prod_inj, text="Psat (psi):")
+    label_Psat.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+    entry_Psat = ttk.Entry(tab_prod_inj)
+    entry_Psat.grid(row=5, column=1, padx=10, pady=5, sticky="w")
+
+    btn_calcular_ip = ttk.Button(tab_prod_inj, text="Calcular IP/II", command=adicionar_poco_ip)
+    btn_calcular_ip.grid(row=6, column=0, columnspan=2, padx=10, pady=10)
+
+    label_ip_result = ttk.Label(tab_prod_inj, text="", font=("Segoe UI", 10, "bold"))
+    label_ip_result.grid(row=8, column=0, columnspan=2, padx=10, pady=10, sticky="w")
+
+    btn_representar_ipr = ttk.Button(tab_prod_inj, text="Representar Curva IPR", command=representar_curva_ipr)
+    btn_representar_ipr.grid(row=9, column=0, columnspan=2, padx=10, pady=10)
+
+    ranking_frame_ip = ttk.Frame(tab_prod_inj, padding="20", relief="sunken")
+    ranking_frame_ip.grid(row=0, column=2, rowspan=9, padx=20, pady=5, sticky="nw")
+
+    ranking_title_ip = ttk.Label(ranking_frame_ip, text="Ranking dos Poços (IP e II)", font=("Segoe UI", 12, "bold"))
+    ranking_title_ip.grid(row=0, column=0, columnspan=3, pady=(0,10), sticky="w")
+
+    ranking_tree_ip = ttk.Treeview(
+        ranking_frame_ip,
+        columns=("pos", "nome", "ip", "ii"),
+        show="headings",
+        height=10
+    )
+    ranking_tree_ip.heading("pos", text="Posição", anchor="w")
+    ranking_tree_ip.heading("nome", text="Nome do Poço", anchor="w")
+    ranking_tree_ip.heading("ip", text="IP", anchor="w")
+    ranking_tree_ip.heading("ii", text="II", anchor="w")
+    ranking_tree_ip.column("pos", width=60, anchor="w")
+    ranking_tree_ip.column("nome", width=150, anchor="w")
+    ranking_tree_ip.column("ip", width=100, anchor="w")
+    ranking_tree_ip.column("ii", width=100, anchor="w")
+    ranking_tree_ip.grid(row=1, column=0, columnspan=2, sticky="w")
+
+    scrollbar_ip = ttk.Scrollbar(ranking_frame_ip, orient="vertical", command=ranking_tree_ip.yview)
+    ranking_tree_ip.configure(yscroll=scrollbar_ip.set)
+    scrollbar_ip.grid(row=1, column=2, sticky="ns")
+
+    btn_limpar_ip = ttk.Button(ranking_frame_ip, text="Limpar Ranking", command=limpar_ranking_ip)
+    btn_limpar_ip.grid(row=2, column=0, columnspan=3, pady=5, sticky="w")
+
+    btn_apagar_ip = ttk.Button(ranking_frame_ip, text="Apagar Poço", command=apagar_poco_ip)
+    btn_apagar_ip.grid(row=3, column=0, columnspan=3, pady=5, sticky="w")
 
 # ------------------- Aba Canhoneamento -------------------
-mainframe_canh = tab_canhoneamento
-mainframe_canh.columnconfigure(0, weight=1)
-mainframe_canh.columnconfigure(1, weight=1)
-
-# Criação de um frame de entrada e tabela de resultados lado a lado na aba Canhoneamento
-frame_esquerda = ttk.Frame(mainframe_canh, padding="10")
-frame_esquerda.grid(row=0, column=0, sticky="nw")
-
-lbl_info_canh = ttk.Label(frame_esquerda, text="Informe os valores para Canhoneamento:")
-lbl_info_canh.grid(row=0, column=0, columnspan=2, pady=(10, 10), sticky="w")
-
-labels_text_canh = [
-    "k (em md):",
-    "rw (em in):",
-    "lp (em in):",
-    "rp (em in):",
-    "Phasing (em in):",
-    "h (em in):",
-    "rc (em in):",
-    "rd (em in):"
-]
-entries_canh = []
-for i, text in enumerate(labels_text_canh):
-    label = ttk.Label(frame_esquerda, text=text)
-    label.grid(row=i+1, column=0, padx=10, pady=5, sticky="w")
-    entry = ttk.Entry(frame_esquerda)
-    entry.grid(row=i+1, column=1, padx=10, pady=5, sticky="w")
-    entries_canh.append(entry)
-
-(entry_k_canh, entry_rw_canh, entry_lp, entry_rp,
- entry_phasing, entry_h_canh, entry_rc, entry_rd_canh) = entries_canh
-
 def processar_canhoneamento():
     try:
         k = float(entry_k_canh.get())
@@ -770,18 +803,32 @@ def processar_canhoneamento():
         rc = float(entry_rc.get())
         rd_canh = float(entry_rd_canh.get())
         
-        # Cálculo de exemplo para os resultados (substitua pelos cálculos reais)
-        deltaP = 3000 / (k ** 0.37) if phasing == 0 else 3000 / (k ** 0.4)
-        Sp = 0    # Exemplo; substitua pelo cálculo real
-        Sdp = 0   # Exemplo; substitua pelo cálculo real
+        # Mesma cadeia de cálculo do canhoneamento (Sp + Sx), com as entradas em in
+        deltaP = calcular_deltaP_canh(k, phasing)
+        hd = calcular_hd(h_canh, lp)
+        rpd = calcular_rpd(rp, h_canh)
+        Sp, Sh, Swb, Sv, a, b = calcular_Sp(rw, lp, hd, rpd, phasing)
+        Sx = calcular_Sx(rd_canh, rw, lp)
+        Sdp = calcular_Sdp(Sp, Sx)
         
-        # Armazena os resultados no ranking global para canhoneamento
+        # Armazena os resultados (com as entradas) no ranking global para canhoneamento
         resultado = {
+            "id": f"C{next(contador_canh)}",
+            "k": k,
+            "rw": rw,
+            "lp": lp,
+            "rp": rp,
+            "phasing": phasing,
+            "h": h_canh,
+            "rc": rc,
+            "rd": rd_canh,
             "deltaP": deltaP,
             "Sp": Sp,
+            "Sx": Sx,
             "Sdp": Sdp
         }
         ranking_canh.append(resultado)
+        registrar_no_diario("processar_canhoneamento", resultado)
         
         # Atualiza a tabela de resultados
         atualizar_ranking_canh()
@@ -789,39 +836,6 @@ def processar_canhoneamento():
     except Exception as e:
         messagebox.showerror("Erro", f"Erro ao processar canhoneamento: {e}")
 
-btn_processar_canh = ttk.Button(frame_esquerda, text="Processar Canhoneamento", command=processar_canhoneamento)
-btn_processar_canh.grid(row=len(labels_text_canh)+1, column=0, columnspan=2, pady=10, sticky="w")
-
-# Criação do frame para a tabela de resultados, reposicionado mais à esquerda (coluna 1 ao invés de 2)
-ranking_frame_canh = ttk.Frame(mainframe_canh, padding="20", relief="sunken")
-ranking_frame_canh.grid(row=0, column=1, rowspan=9, padx=20, pady=5, sticky="w")
-
-ranking_title_canh = ttk.Label(ranking_frame_canh, text="Resultados", font=("Segoe UI", 12, "bold"))
-ranking_title_canh.grid(row=0, column=0, columnspan=3, pady=(0,10), sticky="w")
-
-ranking_tree_canh = ttk.Treeview(
-    ranking_frame_canh,
-    columns=("pos", "deltaP", "Sp", "Sdp"),
-    show="headings",
-    height=10
-)
-ranking_tree_canh.heading("pos", text="Posição", anchor="w")
-ranking_tree_canh.heading("deltaP", text="deltaP", anchor="w")
-ranking_tree_canh.heading("Sp", text="Sp", anchor="w")
-ranking_tree_canh.heading("Sdp", text="Sdp", anchor="w")
-ranking_tree_canh.column("pos", width=60, anchor="w")
-ranking_tree_canh.column("deltaP", width=100, anchor="w")
-ranking_tree_canh.column("Sp", width=100, anchor="w")
-ranking_tree_canh.column("Sdp", width=100, anchor="w")
-ranking_tree_canh.grid(row=1, column=0, columnspan=3, sticky="w")
-
-scrollbar_canh = ttk.Scrollbar(ranking_frame_canh, orient="vertical", command=ranking_tree_canh.yview)
-ranking_tree_canh.configure(yscroll=scrollbar_canh.set)
-scrollbar_canh.grid(row=1, column=3, sticky="ns")
-
-btn_limpar_canh = ttk.Button(ranking_frame_canh, text="Limpar Ranking", command=lambda: [ranking_canh.clear(), atualizar_ranking_canh()])
-btn_limpar_canh.grid(row=2, column=0, columnspan=3, pady=5, sticky="w")
-
 def atualizar_ranking_canh():
     for item in ranking_tree_canh.get_children():
         ranking_tree_canh.delete(item)
@@ -840,4 +854,160 @@ def atualizar_ranking_canh():
             )
         )
 
+def limpar_ranking_canh():
+    ranking_canh.clear()
+    registrar_no_diario("limpar_ranking_canh")
+    atualizar_ranking_canh()
+
+def construir_aba_canhoneamento():
+    global entries_canh, entry_k_canh, entry_rw_canh, entry_lp, entry_rp
+    global entry_phasing, entry_h_canh, entry_rc, entry_rd_canh, ranking_tree_canh
+    mainframe_canh = tab_canhoneamento
+    mainframe_canh.columnconfigure(0, weight=1)
+    mainframe_canh.columnconfigure(1, weight=1)
+
+    # Criação de um frame de entrada e tabela de resultados lado a lado na aba Canhoneamento
+    frame_esquerda = ttk.Frame(mainframe_canh, padding="10")
+    frame_esquerda.grid(row=0, column=0, sticky="nw")
+
+    lbl_info_canh = ttk.Label(frame_esquerda, text="Informe os valores para Canhoneamento:")
+    lbl_info_canh.grid(row=0, column=0, columnspan=2, pady=(10, 10), sticky="w")
+
+    labels_text_canh = [
+        "k (em md):",
+        "rw (em in):",
+        "lp (em in):",
+        "rp (em in):",
+        "Phasing (em in):",
+        "h (em in):",
+        "rc (em in):",
+        "rd (em in):"
+    ]
+    entries_canh = []
+    for i, text in enumerate(labels_text_canh):
+        label = ttk.Label(frame_esquerda, text=text)
+        label.grid(row=i+1, column=0, padx=10, pady=5, sticky="w")
+        entry = ttk.Entry(frame_esquerda)
+        entry.grid(row=i+1, column=1, padx=10, pady=5, sticky="w")
+        entries_canh.append(entry)
+
+    (entry_k_canh, entry_rw_canh, entry_lp, entry_rp,
+     entry_phasing, entry_h_canh, entry_rc, entry_rd_canh) = entries_canh
+
+    btn_processar_canh = ttk.Button(frame_esquerda, text="Processar Canhoneamento", command=processar_canhoneamento)
+    btn_processar_canh.grid(row=len(labels_text_canh)+1, column=0, columnspan=2, pady=10, sticky="w")
+
+    # Criação do frame para a tabela de resultados, reposicionado mais à esquerda (coluna 1 ao invés de 2)
+    ranking_frame_canh = ttk.Frame(mainframe_canh, padding="20", relief="sunken")
+    ranking_frame_canh.grid(row=0, column=1, rowspan=9, padx=20, pady=5, sticky="w")
+
+    ranking_title_canh = ttk.Label(ranking_frame_canh, text="Resultados", font=("Segoe UI", 12, "bold"))
+    ranking_title_canh.grid(row=0, column=0, columnspan=3, pady=(0,10), sticky="w")
+
+    ranking_tree_canh = ttk.Treeview(
+        ranking_frame_canh,
+        columns=("pos", "deltaP", "Sp", "Sdp"),
+        show="headings",
+        height=10
+    )
+    ranking_tree_canh.heading("pos", text="Posição", anchor="w")
+    ranking_tree_canh.heading("deltaP", text="deltaP", anchor="w")
+    ranking_tree_canh.heading("Sp", text="Sp", anchor="w")
+    ranking_tree_canh.heading("Sdp", text="Sdp", anchor="w")
+    ranking_tree_canh.column("pos", width=60, anchor="w")
+    ranking_tree_canh.column("deltaP", width=100, anchor="w")
+    ranking_tree_canh.column("Sp", width=100, anchor="w")
+    ranking_tree_canh.column("Sdp", width=100, anchor="w")
+    ranking_tree_canh.grid(row=1, column=0, columnspan=3, sticky="w")
+
+    scrollbar_canh = ttk.Scrollbar(ranking_frame_canh, orient="vertical", command=ranking_tree_canh.yview)
+    ranking_tree_canh.configure(yscroll=scrollbar_canh.set)
+    scrollbar_canh.grid(row=1, column=3, sticky="ns")
+
+    btn_limpar_canh = ttk.Button(ranking_frame_canh, text="Limpar Ranking", command=limpar_ranking_canh)
+    btn_limpar_canh.grid(row=2, column=0, columnspan=3, pady=5, sticky="w")
+
+# ------------------- Aba Painel do Campo -------------------
+painel_campo = None
+redesenho_pendente = None
+
+def atualizar_painel():
+    global painel_campo
+    import painel
+    painel_campo = painel.PainelCampo.de_pocos(poços, ranking_canh)
+    redesenhar_painel()
+
+def carregar_carteira_painel():
+    global painel_campo
+    caminho = filedialog.askopenfilename(
+        title="Carregar carteira de poços",
+        filetypes=[("Carteira NumPy", "*.npz")]
+    )
+    if not caminho:
+        return
+    try:
+        import painel
+        painel_campo = painel.carregar_carteira(caminho)
+        redesenhar_painel()
+    except Exception as e:
+        messagebox.showerror("Erro", f"Erro ao carregar a carteira: {e}")
+
+def redesenhar_painel():
+    global redesenho_pendente
+    redesenho_pendente = None
+    if painel_campo is None:
+        return
+    # Os dados já estão binados; o redesenho depende só do tamanho do canvas
+    widget = canvas_painel.get_tk_widget()
+    painel_campo.desenhar(figura_painel, widget.winfo_width(), widget.winfo_height())
+    canvas_painel.draw_idle()
+
+def agendar_redesenho(event=None):
+    # Agrupa os eventos de redimensionamento em um único redesenho
+    global redesenho_pendente
+    if redesenho_pendente:
+        app.after_cancel(redesenho_pendente)
+    redesenho_pendente = app.after(150, redesenhar_painel)
+
+def construir_aba_painel():
+    global figura_painel, canvas_painel
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    tab_painel.columnconfigure(0, weight=1)
+    tab_painel.rowconfigure(1, weight=1)
+
+    frame_botoes = ttk.Frame(tab_painel)
+    frame_botoes.grid(row=0, column=0, sticky="w")
+
+    btn_atualizar_painel = ttk.Button(frame_botoes, text="Atualizar com os poços adicionados", command=atualizar_painel)
+    btn_atualizar_painel.grid(row=0, column=0, padx=10, pady=5, sticky="w")
+
+    btn_carregar_carteira = ttk.Button(frame_botoes, text="Carregar carteira (.npz)", command=carregar_carteira_painel)
+    btn_carregar_carteira.grid(row=0, column=1, padx=10, pady=5, sticky="w")
+
+    figura_painel = Figure(figsize=(12, 5), dpi=100)
+    canvas_painel = FigureCanvasTkAgg(figura_painel, master=tab_painel)
+    canvas_painel.get_tk_widget().grid(row=1, column=0, sticky="nsew")
+    canvas_painel.get_tk_widget().bind("<Configure>", agendar_redesenho, add="+")
+    atualizar_painel()
+
+# ------------------- Construção das abas sob demanda -------------------
+# Cada aba só cria seus widgets na primeira vez em que é selecionada,
+# para que a janela principal apareça sem esperar pelas três abas.
+construtores_abas = {
+    str(tab_efficiencia): construir_aba_eficiencia,
+    str(tab_prod_inj): construir_aba_produtividade,
+    str(tab_canhoneamento): construir_aba_canhoneamento,
+    str(tab_painel): construir_aba_painel,
+}
+
+def construir_aba_selecionada(event=None):
+    construtor = construtores_abas.pop(notebook.select(), None)
+    if construtor:
+        construtor()
+
+notebook.bind("<<NotebookTabChanged>>", construir_aba_selecionada)
+construir_aba_selecionada()
+
 tk.mainloop()
\ No newline at end of file
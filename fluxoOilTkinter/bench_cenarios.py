@@ -0,0 +1,73 @@
+import argparse
+import time
+
+import numpy as np
+
+import calculos_vetorizados as cv
+from bench_ranking import gerar_fatia
+from cenarios import matriz_cenarios, melhor_cenario
+
+# Mede a matriz "e se" de completação: poços x projetos de canhoneamento x
+# estimulações, e confere o melhor cenário contra um laço por cenário.
+
+
+def gerar_projetos(rng, m: int) -> dict:
+    return {
+        "lp": rng.uniform(6.0, 24.0, m),
+        "rp": rng.uniform(0.2, 0.6, m),
+        "h": rng.uniform(1.0, 6.0, m),
+        "phasing": rng.choice([0.0, 180.0], m),
+    }
+
+
+def gerar_estimulacoes(rng, s: int) -> dict:
+    return {"kd": rng.uniform(5.0, 150.0, s), "rd": rng.uniform(1.0, 5.0, s)}
+
+
+def conferir(pocos, projetos, estimulacoes, melhor, amostra: int):
+    # Avalia alguns poços isoladamente, fora dos blocos, e confere a escolha
+    m, s = projetos["lp"].size, estimulacoes["kd"].size
+    for i in range(amostra):
+        poco = {nome: pocos[nome][i:i + 1] for nome in pocos}
+        matriz = matriz_cenarios(poco, projetos, estimulacoes)["qo"].reshape(m * s)
+        valores = np.where(np.isnan(matriz), -np.inf, matriz)
+        if np.all(np.isnan(matriz)):
+            assert melhor["projeto"][i] == -1
+            continue
+        j = int(np.argmax(valores))
+        assert (melhor["projeto"][i], melhor["estimulacao"][i]) == (j // s, j % s)
+        assert melhor["qo"][i] == matriz[j]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da matriz de cenários de completação")
+    parser.add_argument("--pocos", type=int, default=5_000)
+    parser.add_argument("--projetos", type=int, default=20)
+    parser.add_argument("--estimulacoes", type=int, default=15)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    pocos = gerar_fatia(0, args.pocos)
+    projetos = gerar_projetos(rng, args.projetos)
+    estimulacoes = gerar_estimulacoes(rng, args.estimulacoes)
+    cenarios = args.projetos * args.estimulacoes
+
+    inicio = time.perf_counter()
+    melhor = melhor_cenario(pocos, projetos, estimulacoes)
+    duracao = time.perf_counter() - inicio
+    total = args.pocos * cenarios
+    print(f"{args.pocos} poços x {cenarios} cenários = {total} avaliações em {duracao:.2f} s "
+          f"({total / duracao / 1e6:.1f} M/s)")
+
+    conferir(pocos, projetos, estimulacoes, melhor, 50)
+    sem_cenario = int(np.sum(melhor["projeto"] < 0))
+    ganho = melhor["qo"] / cv.calcular_qo_alternativo(
+        pocos["ko"], pocos["h"], pocos["pr"], pocos["pw"], pocos["uo"], pocos["Bo"], pocos["re"], pocos["rw"],
+        cv.calcular_skin(pocos["ko"], pocos["kd"], pocos["rd"], pocos["rw"]),
+    )
+    print(f"poços sem cenário válido: {sem_cenario}")
+    print(f"qo do melhor cenário / qo atual (só dano): mediana {np.nanmedian(ganho):.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import math
+import random
+import tempfile
+import time
+
+import diario
+from carga_servico import registro_fluxo
+
+# Compara a reconstrução de rankings pelo diário (snapshot + reaplicação)
+# com o recálculo de todos os poços desde o início da sessão.
+
+
+def calcular_poco(nome: str, e: dict) -> dict:
+    # Mesmos cálculos de adicionar_poco em app.py
+    ln_part = math.log(0.472 * e["re"] / e["rw"])
+    skin = ((e["ko"] / e["kd"]) - 1) * math.log(e["rd"] / e["rw"])
+    numerador = 0.00708 * e["ko"] * e["h"] * (e["pr"] - e["pw"])
+    fluxo = numerador / (e["uo"] * e["Bo"] * ln_part)
+    return {
+        "nome": nome,
+        "fluxo": fluxo,
+        "skin": skin,
+        "fluxo_S": numerador / (e["uo"] * e["Bo"] * (ln_part + skin)),
+        "deltaP": (fluxo * e["Bo"] * e["uo"] * e["L"]) / (0.00127 * e["A"] * e["ko"]),
+        "Eficiência(FE)": ln_part / (ln_part + skin),
+        **e,
+    }
+
+
+def recalcular(entradas: list, ate: int) -> dict:
+    # Refaz a sessão desde o início, calculando cada poço de novo
+    estado = diario.estado_vazio()
+    for seq, (op, dados) in enumerate(entradas[:ate], start=1):
+        if op == "adicionar_poco":
+            dados = calcular_poco(dados["nome"], dados["entradas"])
+        diario.aplicar(estado, {"seq": seq, "op": op, "dados": dados})
+    return estado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de reconstrução pelo diário")
+    parser.add_argument("--acoes", type=int, default=200_000)
+    parser.add_argument("--snapshot", type=int, default=10_000)
+    parser.add_argument("--repeticoes", type=int, default=3, help="tempos são o mínimo das repetições")
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    entradas = [("inicio_sessao", {})]
+    for i in range(args.acoes - 1):
+        sorteio = rng.random()
+        if sorteio < 0.02 and i:
+            entradas.append(("apagar_poco", {"nome": f"P{rng.randrange(i)}"}))
+        elif sorteio < 0.0025:
+            entradas.append(("limpar_ranking", {}))
+        else:
+            entradas.append(("adicionar_poco", {"nome": f"P{i}", "entradas": registro_fluxo(rng)}))
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        registro = diario.DiarioCalculos(diretorio, snapshot_a_cada=args.snapshot)
+        inicio = time.perf_counter()
+        for op, dados in entradas:
+            if op == "adicionar_poco":
+                dados = calcular_poco(dados["nome"], dados["entradas"])
+            registro.registrar(op, dados)
+        registro.fechar()
+        escrita = time.perf_counter() - inicio
+        print(f"{args.acoes} ações gravadas em {escrita:.2f} s ({args.acoes / escrita:.0f} ações/s), "
+              f"snapshot a cada {args.snapshot}\n")
+
+        print(f"{'até seq':>9s} {'diário (ms)':>12s} {'recálculo (ms)':>15s} {'poços':>7s}")
+        for fracao in (0.25, 0.5, 0.75, 1.0):
+            ate = int(args.acoes * fracao)
+            t_diario = t_recalculo = float("inf")
+            for _ in range(args.repeticoes):
+                inicio = time.perf_counter()
+                estado = diario.reconstruir(diretorio, ate_seq=ate)
+                t_diario = min(t_diario, time.perf_counter() - inicio)
+                inicio = time.perf_counter()
+                referencia = recalcular(entradas, ate)
+                t_recalculo = min(t_recalculo, time.perf_counter() - inicio)
+            assert diario.rankings(estado)["poços"] == diario.rankings(referencia)["poços"]
+            print(f"{ate:9d} {t_diario * 1000:12.1f} {t_recalculo * 1000:15.1f} {len(estado['poços']):7d}")
+
+
+if __name__ == "__main__":
+    main()
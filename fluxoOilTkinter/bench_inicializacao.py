@@ -0,0 +1,149 @@
+import argparse
+import ast
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Mede o tempo até a primeira janela de app.py: cada rodada inicia um novo
+# interpretador, executa o aplicativo e, no lugar de tk.mainloop(), processa
+# os eventos pendentes (janela desenhada) e encerra. Também registra o custo
+# da primeira seleção de cada aba e se o matplotlib foi carregado na partida.
+# Requer um display (no Linux, DISPLAY ou --xvfb).
+#
+# --app mede outro arquivo de aplicativo e --revisao mede o app.py de uma
+# revisão do git (por exemplo, 40f561b, anterior às abas sob demanda).
+# --xvfb inicia um servidor X virtual para as rodadas quando não há display.
+# --importacoes mede só as importações de nível de módulo do app, que não
+# precisam de display.
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+CODIGO = """
+import json, runpy, sys, time
+import tkinter as tk
+inicio = time.perf_counter()
+
+def primeira_janela():
+    raiz = tk._default_root
+    raiz.update()
+    medidas = {"janela": time.perf_counter() - inicio, "matplotlib": "matplotlib" in sys.modules}
+    notebook = next(w for w in raiz.winfo_children() if w.winfo_class() == "TNotebook")
+    for indice, aba in enumerate(notebook.tabs()[1:], start=1):
+        t0 = time.perf_counter()
+        notebook.select(aba)
+        raiz.update()
+        medidas[f"aba_{indice}"] = time.perf_counter() - t0
+    print(json.dumps(medidas))
+    raiz.destroy()
+
+tk.mainloop = primeira_janela
+sys.argv = [APP]
+runpy.run_path(APP, run_name="__main__")
+"""
+
+
+def rodada(app: str) -> dict:
+    # O diário do aplicativo vai para um diretório temporário, nunca o do usuário
+    with tempfile.TemporaryDirectory(prefix="diario_bench_") as diretorio:
+        inicio = time.perf_counter()
+        saida = subprocess.run(
+            [sys.executable, "-c", CODIGO.replace("APP", repr(app))],
+            capture_output=True, text=True, cwd=os.path.dirname(APP),
+            env={**os.environ, "CALCULADORA_DIARIO": diretorio},
+        )
+        fim = time.perf_counter()
+    if saida.returncode:
+        # Sem display o Tk falha ao criar a janela ("no display name ...")
+        erro = saida.stderr.strip().splitlines()
+        raise SystemExit(f"{os.path.basename(app)} falhou: {erro[-1] if erro else saida.returncode}")
+    medidas = json.loads(saida.stdout.strip().splitlines()[-1])
+    medidas["processo"] = fim - inicio
+    return medidas
+
+
+def app_da_revisao(revisao: str, destino: str) -> str:
+    # Extrai o app.py da revisão; os módulos locais continuam vindo da árvore
+    # atual, pois as rodadas executam no diretório do aplicativo
+    conteudo = subprocess.run(
+        ["git", "show", f"{revisao}:./app.py"], capture_output=True, text=True,
+        check=True, cwd=os.path.dirname(APP),
+    ).stdout
+    caminho = os.path.join(destino, f"app_{revisao}.py")
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(conteudo)
+    return caminho
+
+
+def iniciar_xvfb(tela: str = ":99") -> subprocess.Popen:
+    executavel = shutil.which("Xvfb")
+    if executavel is None:
+        raise SystemExit("Xvfb não encontrado no PATH (no Debian/Ubuntu: apt install xvfb).")
+    servidor = subprocess.Popen([executavel, tela, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # Espera o soquete do servidor aparecer antes da primeira rodada
+    soquete = f"/tmp/.X11-unix/X{tela.lstrip(':')}"
+    for _ in range(100):
+        if os.path.exists(soquete):
+            break
+        if servidor.poll() is not None:
+            raise SystemExit(f"Xvfb {tela} encerrou ao iniciar (código {servidor.returncode}).")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = tela
+    return servidor
+
+
+def importacoes(app: str) -> float:
+    # Executa num interpretador novo só os imports de nível de módulo do app,
+    # com o backend do Tk que o aplicativo usa no Windows
+    with open(app, encoding="utf-8") as f:
+        arvore = ast.parse(f.read())
+    linhas = [ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))]
+    codigo = "import time\ninicio = time.perf_counter()\n" + "\n".join(linhas) + "\nprint(time.perf_counter() - inicio)"
+    saida = subprocess.run(
+        [sys.executable, "-c", codigo], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(APP), env={**os.environ, "MPLBACKEND": "TkAgg"},
+    )
+    return float(saida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo até a primeira janela do aplicativo")
+    parser.add_argument("--rodadas", type=int, default=5)
+    parser.add_argument("--app", default=APP, help="versão do app.py a medir")
+    parser.add_argument("--revisao", help="mede o app.py desta revisão do git (ex.: 40f561b)")
+    parser.add_argument("--xvfb", action="store_true", help="inicia um Xvfb para as rodadas")
+    parser.add_argument("--importacoes", action="store_true", help="mede só os imports (sem display)")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory(prefix="app_bench_") as temporario:
+        app = app_da_revisao(args.revisao, temporario) if args.revisao else os.path.abspath(args.app)
+        servidor = iniciar_xvfb() if args.xvfb and not args.importacoes else None
+        try:
+            medir(args, app)
+        finally:
+            if servidor is not None:
+                servidor.terminate()
+                servidor.wait()
+
+
+def medir(args, app: str):
+    if args.importacoes:
+        tempos = [importacoes(app) for _ in range(args.rodadas)]
+        print(f"Rodadas: {args.rodadas} | imports de nível de módulo de {os.path.basename(app)}: "
+              f"mediana {statistics.median(tempos) * 1000:.0f} ms, mín. {min(tempos) * 1000:.0f} ms")
+        return
+    rodadas = [rodada(app) for _ in range(args.rodadas)]
+    print(f"Rodadas: {args.rodadas} (medianas)")
+    print(f"  Até a primeira janela (com o interpretador): {statistics.median(r['processo'] for r in rodadas) * 1000:.0f} ms")
+    print(f"  Até a primeira janela (a partir do script):  {statistics.median(r['janela'] for r in rodadas) * 1000:.0f} ms")
+    for chave in sorted(k for k in rodadas[0] if k.startswith("aba_")):
+        print(f"  Primeira seleção da {chave.replace('_', ' ')}:          {statistics.median(r[chave] for r in rodadas) * 1000:.0f} ms")
+    print(f"  matplotlib carregado na partida: {'sim' if rodadas[0]['matplotlib'] else 'não'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import argparse
+import time
+
+import numpy as np
+
+import calculos_vetorizados as cv
+import kernels_jit
+
+# Compara os backends de kernels_jit.py com a referência NumPy: tempo médio
+# por chamada e diferença para calcular_Sp e a curva de Vogel.
+#
+# Não há tolerância fixa em ULPs do resultado: Sp = Sh + Swb + Sv se cancela
+# (Sh ~ -Swb com phasing 0°) e |Sp| chega a ~1e-5 com termos de ~0.3, então
+# poucos ULPs em cada termo viram milhares de ULPs de Sp. O limite é
+# derivado por elemento, com eps = 2**-52 e U = ULP_FUNCAO, a diferença
+# máxima entre log/exp/pow do NumPy (SIMD) e da libm usada pelo Numba:
+#   Sh  = log(4 rw / lp)            argumento idêntico:     U eps |Sh|
+#   Swb = C1 exp(C2 rwD)            argumento idêntico:     (U + 2) eps |Swb|
+#   a   = a1 log(rpd) + a2          log difere em U ULPs:   da = eps (U |a1 ln rpd| + 2 |a|)
+#   Sv  = 10**a hd**(b-1) rpd**b    10**a amplifica da por ln(10); três pows
+#                                   e dois produtos:        eps (ln(10) da / eps + 3U + 4) |Sv|
+#   Sh + Swb + Sv                   duas somas, nos dois lados: 4 eps (|Sh| + |Swb| + |Sv|)
+# Na curva de Vogel só há operações básicas (corretamente arredondadas, sem
+# FMA com fastmath=False): cerca de seis arredondamentos por lado sobre
+# qc (1.8 Pe/Psat + 0.8 + 0.2 r + 0.8 r²), r = Pwfx / Psat.
+# Medido (2e6 poços, AVX-512): log 1 ULP, exp 2 ULP, Sv até 34 ULP; a maior
+# diferença usa 21% do limite acima, embora chegue a 8193 ULPs de Sp.
+ULP_FUNCAO = 4
+EPS = np.finfo(np.float64).eps
+
+
+def limite_Sp(rw, lp, hd, rpd, phasing) -> np.ndarray:
+    _, Sh, Swb, Sv, a, _ = cv.calcular_Sp(rw, lp, hd, rpd, phasing)
+    a1 = cv.constantes_sp(phasing)[2]
+    da = ULP_FUNCAO * np.abs(a1 * np.log(rpd)) + 2 * np.abs(a)
+    return EPS * (
+        ULP_FUNCAO * np.abs(Sh)
+        + (ULP_FUNCAO + 2) * np.abs(Swb)
+        + (np.log(10) * da + 3 * ULP_FUNCAO + 4) * np.abs(Sv)
+        + 4 * (np.abs(Sh) + np.abs(Swb) + np.abs(Sv))
+    )
+
+
+def limite_curva(qc, Pe, Psat, Pwfx) -> np.ndarray:
+    razao = Pwfx[None, :] / Psat[:, None]
+    termos = (1.8 * Pe / Psat + 0.8)[:, None] + 0.2 * razao + 0.8 * razao ** 2
+    return 2 * 6 * EPS * np.abs(qc)[:, None] * termos
+
+
+LIMITES = {"calcular_Sp": limite_Sp, "criar_curva": limite_curva}
+
+
+def diferenca_ulp(referencia: np.ndarray, obtido: np.ndarray) -> np.ndarray:
+    return np.abs(obtido - referencia) / np.spacing(np.abs(referencia))
+
+
+def cronometrar(funcao, repeticoes: int) -> float:
+    funcao()  # aquecimento (inclui a compilação do Numba)
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def dados_canhoneamento(n: int, rng) -> dict:
+    h = rng.uniform(0.5, 4, n)
+    lp = rng.uniform(6, 18, n)
+    return {
+        "rw": rng.uniform(3, 6, n),
+        "lp": lp,
+        "hd": cv.calcular_hd(h, lp),
+        "rpd": cv.calcular_rpd(rng.uniform(0.1, 0.4, n), h),
+        "phasing": rng.choice([0.0, 180.0], n),
+    }
+
+
+def dados_vogel(n: int, rng) -> dict:
+    Pe = rng.uniform(3000, 5000, n)
+    psat = Pe * rng.uniform(0.5, 0.9, n)
+    return {
+        "qc": cv.calcular_qc(rng.uniform(100, 2000, n), Pe, psat * rng.uniform(1.01, 1.1, n), psat),
+        "Pe": Pe,
+        "Psat": psat,
+        "Pwfx": np.linspace(0, 3000, 64),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos backends de kernels_jit.py")
+    parser.add_argument("--pocos", type=int, default=2_000_000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    casos = {
+        "calcular_Sp": (kernels_jit.calcular_Sp, dados_canhoneamento(args.pocos, rng)),
+        "criar_curva": (kernels_jit.criar_curva, dados_vogel(args.pocos // 64, rng)),
+    }
+    print(f"Backends disponíveis: {', '.join(kernels_jit.BACKENDS)}")
+    for nome, (funcao, dados) in casos.items():
+        referencia = funcao(**dados, backend="numpy")
+        tempo_ref = cronometrar(lambda: funcao(**dados, backend="numpy"), args.repeticoes)
+        print(f"\n{nome} ({referencia.size} valores)")
+        for backend in kernels_jit.BACKENDS:
+            out = np.empty_like(referencia)
+            tempo = cronometrar(lambda: funcao(**dados, backend=backend, out=out), args.repeticoes)
+            ulp = diferenca_ulp(referencia, out)
+            iguais = np.count_nonzero(out == referencia) / out.size
+            # Fração do limite derivado usada por elemento (<= 1 é ok)
+            uso = np.abs(out - referencia) / LIMITES[nome](**dados)
+            situacao = "ok" if uso.max() <= 1 else "FORA DO LIMITE"
+            print(f"  {backend:6s} {tempo * 1000:9.2f} ms  speedup {tempo_ref / tempo:5.2f}x  "
+                  f"ULP p99 {np.percentile(ulp, 99):.0f} máx. {ulp.max():.0f}  "
+                  f"uso do limite máx. {uso.max():.0%}  idênticos {iguais:.2%}  {situacao}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import calculos_vetorizados as cv
+from bench_ranking import gerar_fatia
+from painel import PainelCampo
+
+# Mede o painel do campo: custo único de agregação (proporcional ao número de
+# poços) e custo de cada redesenho (proporcional à resolução da tela).
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do painel do campo")
+    parser.add_argument("--pocos", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--resolucoes", nargs="+", default=["800x500", "1600x900", "2560x1440"])
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'poços':>9s} {'agregação (s)':>14s}  " + "  ".join(f"{r:>12s}" for r in args.resolucoes))
+    for n in args.pocos:
+        resultados = cv.calcular_fluxo(gerar_fatia(0, n))
+        Sdp = rng.normal(5, 2, n)
+        inicio = time.perf_counter()
+        painel = PainelCampo(
+            skin=resultados["skin"], fe=resultados["Eficiência(FE)"],
+            qo=resultados["fluxo"], qo_S=resultados["fluxo_S"], Sdp=Sdp,
+        )
+        agregacao = time.perf_counter() - inicio
+        tempos = []
+        for resolucao in args.resolucoes:
+            largura, altura = (int(v) for v in resolucao.split("x"))
+            fig = Figure(figsize=(largura / 100, altura / 100), dpi=100)
+            canvas = FigureCanvasAgg(fig)
+            inicio = time.perf_counter()
+            painel.desenhar(fig, largura, altura)
+            canvas.draw()
+            tempos.append(time.perf_counter() - inicio)
+        print(f"{n:9d} {agregacao:14.3f}  " + "  ".join(f"{t * 1000:10.0f}ms" for t in tempos))
+
+
+if __name__ == "__main__":
+    main()
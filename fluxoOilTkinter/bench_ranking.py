@@ -0,0 +1,69 @@
+import argparse
+import functools
+import time
+import tracemalloc
+
+import numpy as np
+
+from ranking_distribuido import ranking_distribuido
+
+# Mede o ranking em fatias para um total fixo de poços, variando o número
+# de fatias: latência do top-k e do ranking completo (em fluxo), pico de
+# memória do coordenador (tracemalloc) e pico de RSS dos processos.
+
+
+def gerar_fatia(semente: int, n: int) -> dict:
+    # Poços sintéticos gerados dentro do processo da fatia
+    rng = np.random.default_rng(semente)
+    return {
+        "ko": rng.uniform(10, 500, n), "h": rng.uniform(10, 100, n),
+        "pr": rng.uniform(2000, 5000, n), "pw": rng.uniform(500, 1900, n),
+        "uo": rng.uniform(0.5, 5, n), "Bo": rng.uniform(1.0, 1.5, n),
+        "re": rng.uniform(500, 2000, n), "rw": rng.uniform(0.25, 0.5, n),
+        "L": rng.uniform(10, 100, n), "A": rng.uniform(1, 10, n),
+        "rd": rng.uniform(0.5, 3, n), "kd": rng.uniform(1, 50, n),
+    }
+
+
+def executar(fatias, k, processos):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    quantidade = 0
+    ultimo = None
+    resumos = []
+    for posicao, _, valor in ranking_distribuido(fatias, "fluxo", k=k, processos=processos, resumos=resumos):
+        assert ultimo is None or valor <= ultimo
+        ultimo = valor
+        quantidade = posicao
+    decorrido = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Maior pico de RSS entre os processos desta execução
+    picos = [r["pico_rss"] for r in resumos if r["pico_rss"] is not None]
+    return decorrido, pico, quantidade, max(picos) if picos else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do ranking em fatias")
+    parser.add_argument("--pocos", type=int, default=2_000_000)
+    parser.add_argument("--fatias", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--processos", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{args.pocos} poços no total; top-k com k = {args.k}\n")
+    print(f"{'fatias':>6s} {'top-k (s)':>10s} {'coord. top-k':>13s} {'completo (s)':>13s} "
+          f"{'coord. completo':>16s} {'RSS proc. (MB)':>15s}")
+    for n_fatias in args.fatias:
+        tamanho = args.pocos // n_fatias
+        fatias = [functools.partial(gerar_fatia, i, tamanho) for i in range(n_fatias)]
+        t_topk, pico_topk, _, rss_topk = executar(fatias, args.k, args.processos)
+        t_total, pico_total, quantidade, rss_total = executar(fatias, None, args.processos)
+        rss = max(rss_topk, rss_total) / 1e6
+        print(f"{n_fatias:6d} {t_topk:10.3f} {pico_topk / 1e6:10.2f} MB {t_total:13.3f} "
+              f"{pico_total / 1e6:13.2f} MB {rss:15.1f}")
+        assert quantidade == tamanho * n_fatias
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import warnings
+
+import numpy as np
+
+import calculos_vetorizados as cv
+import unidades
+
+# Modo de baixa memória para lotes grandes (Monte Carlo, varreduras).
+# As colunas são percorridas em blocos de tamanho fixo; todas as fórmulas
+# escrevem com out= em buffers de trabalho alocados uma única vez, sem criar
+# vetores intermediários. Colunas já na precisão escolhida são lidas sem
+# cópia; as demais são convertidas bloco a bloco para buffers de entrada.
+# Por isso o modo float32 só economiza memória quando as colunas já chegam
+# em float32: as saídas ocupam metade e os buffers de trabalho cerca de 70%
+# dos de float64 (Swb usa dois buffers float64). Com colunas float64 as
+# cópias de entrada deixam os buffers maiores que em float64 (medido por
+# relatorio_precisao.py, junto com os limites de erro abaixo).
+#
+# Limites medidos (1e6 poços em faixas de campo usuais):
+#   calcular_qo          erro relativo p99 ~3e-7, máx. < 1e-6
+#   calcular_eficiencia  erro relativo p99 ~1e-7, máx. < 1e-6
+#   calcular_Sp (0°)     erro relativo p99 ~2e-6; erro absoluto máx. ~4e-2
+#                        onde Sh, Swb e Sv se cancelam e Sp fica perto de zero
+#   calcular_Sp (180°)   com C1 = 0.026 e C2 = 532, Swb passa do maior
+#                        float32 para rwD > ~0.174 (a maioria dos casos).
+#                        Swb é calculado em float64 (o que evita o estouro
+#                        só de exp na faixa 0.167 < rwD < 0.174), mas um
+#                        valor acima de ~3.4e38 não cabe em float32: essas
+#                        linhas saem como inf e canhoneamento() emite
+#                        PrecisaoInsuficiente com a contagem. Use float64.
+#
+# Em float64 a ordem das operações é a mesma de calculos_vetorizados.py, e os
+# resultados são idênticos bit a bit aos da referência.
+
+PRECISOES = {"float64": np.float64, "float32": np.float32}
+
+SAIDAS_FLUXO = ("fluxo", "skin", "fluxo_S", "deltaP", "Eficiência(FE)")
+SAIDAS_CANHONEAMENTO = ("deltaP", "Sp", "Sx", "Sdp")
+
+
+class PrecisaoInsuficiente(RuntimeWarning):
+    """Resultados finitos em float64 que não cabem na precisão escolhida."""
+
+
+class CalculadoraBlocos:
+    """
+    Calcula fluxo e canhoneamento em blocos, na precisão escolhida. Para
+    o ganho de memória do modo float32, passe as colunas já em float32.
+    """
+
+    def __init__(self, precisao: str = "float64", tamanho_bloco: int = 65536):
+        if precisao not in PRECISOES:
+            raise ValueError(f"Precisão deve ser uma de: {', '.join(PRECISOES)}.")
+        if tamanho_bloco <= 0:
+            raise ValueError("tamanho_bloco deve ser maior que zero.")
+        self.precisao = precisao
+        self.dtype = np.dtype(PRECISOES[precisao])
+        self.tamanho_bloco = tamanho_bloco
+        self._buffers = {}
+
+    def _buffer(self, nome: str, n: int, dtype=None) -> np.ndarray:
+        # Buffers de trabalho reaproveitados entre blocos e entre chamadas
+        dtype = dtype or self.dtype
+        buffer = self._buffers.get(nome)
+        if buffer is None or buffer.dtype != dtype:
+            buffer = self._buffers[nome] = np.empty(self.tamanho_bloco, dtype=dtype)
+        return buffer[:n]
+
+    def _entradas(self, colunas: dict, nomes, fatia: slice, n: int) -> dict:
+        entradas = {}
+        for nome in nomes:
+            coluna = np.asarray(colunas[nome])[fatia]
+            if coluna.dtype == self.dtype:
+                entradas[nome] = coluna
+            else:
+                entradas[nome] = self._buffer("in_" + nome, n)
+                np.copyto(entradas[nome], coluna, casting="unsafe")
+        return entradas
+
+    def _saidas(self, nomes, n: int, saida: dict | None) -> dict:
+        saida = saida if saida is not None else {}
+        for nome in nomes:
+            if nome not in saida:
+                saida[nome] = np.empty(n, dtype=self.dtype)
+        return saida
+
+    def _blocos(self, n: int):
+        for inicio in range(0, n, self.tamanho_bloco):
+            fim = min(inicio + self.tamanho_bloco, n)
+            yield slice(inicio, fim), fim - inicio
+
+    def fluxo(self, colunas: dict, saida: dict | None = None) -> dict:
+        n = len(colunas["ko"])
+        saida = self._saidas(SAIDAS_FLUXO, n, saida)
+        for fatia, m in self._blocos(n):
+            c = self._entradas(colunas, tuple(unidades.COLUNAS_FLUXO), fatia, m)
+            num, den = self._buffer("num", m), self._buffer("den", m)
+            ln_part, uobo = self._buffer("ln", m), self._buffer("uobo", m)
+            fluxo, skin = saida["fluxo"][fatia], saida["skin"][fatia]
+
+            # 0.00708 * ko * h * (pr - pw)
+            np.multiply(c["ko"], 0.00708, out=num)
+            num *= c["h"]
+            np.subtract(c["pr"], c["pw"], out=den)
+            num *= den
+            # ln(0.472 * re / rw)
+            np.multiply(c["re"], 0.472, out=ln_part)
+            ln_part /= c["rw"]
+            np.log(ln_part, out=ln_part)
+            # qo
+            np.multiply(c["uo"], c["Bo"], out=uobo)
+            np.multiply(uobo, ln_part, out=den)
+            np.divide(num, den, out=fluxo)
+            # skin = (ko / kd - 1) * ln(rd / rw)
+            np.divide(c["ko"], c["kd"], out=skin)
+            skin -= 1
+            np.divide(c["rd"], c["rw"], out=den)
+            np.log(den, out=den)
+            skin *= den
+            # FE e qo com S
+            np.add(ln_part, skin, out=den)
+            np.divide(ln_part, den, out=saida["Eficiência(FE)"][fatia])
+            den *= uobo
+            np.divide(num, den, out=saida["fluxo_S"][fatia])
+            # deltaP = (qo * Bo * uo * L) / (0.00127 * A * ko)
+            np.multiply(fluxo, c["Bo"], out=num)
+            num *= c["uo"]
+            num *= c["L"]
+            np.multiply(c["A"], 0.00127, out=den)
+            den *= c["ko"]
+            np.divide(num, den, out=saida["deltaP"][fatia])
+        return saida
+
+    def canhoneamento(self, colunas: dict, saida: dict | None = None) -> dict:
+        n = len(colunas["k"])
+        saida = self._saidas(SAIDAS_CANHONEAMENTO, n, saida)
+        for fatia, m in self._blocos(n):
+            c = self._entradas(colunas, tuple(unidades.COLUNAS_CANHONEAMENTO), fatia, m)
+            oleo = self._buffer("oleo", m, np.dtype(bool))
+            np.equal(c["phasing"], 0, out=oleo)
+            t, hd, rpd = self._buffer("t", m), self._buffer("hd", m), self._buffer("rpd", m)
+            Sp, Sx = saida["Sp"][fatia], saida["Sx"][fatia]
+
+            # deltaP = 3000 / k ** (0.37 se 0°, 0.4 se 180°)
+            self._constante(t, oleo, 0.37, 0.4)
+            np.power(c["k"], t, out=t)
+            np.divide(3000, t, out=saida["deltaP"][fatia])
+            # hd = h / lp; rpd = (rp / (2 h)) * 2
+            np.divide(c["h"], c["lp"], out=hd)
+            np.multiply(c["h"], 2, out=t)
+            np.divide(c["rp"], t, out=rpd)
+            rpd *= 2.0
+            self._Sp(c, oleo, hd, rpd, Sp, m)
+            # Sx pela razão rd / (rw + lp)
+            np.add(c["rw"], c["lp"], out=t)
+            np.divide(c["rd"], t, out=t)
+            Sx.fill(-0.0024)
+            np.copyto(Sx, -0.002, where=t >= 1.5)
+            np.copyto(Sx, -0.001, where=t >= 2)
+            np.copyto(Sx, 0.0, where=t >= 18)
+            np.add(Sp, Sx, out=saida["Sdp"][fatia])
+        if self.dtype != np.float64:
+            # As entradas chegam validadas: resultado não finito é estouro
+            estouros = n - np.count_nonzero(np.isfinite(saida["Sdp"][:n]))
+            if estouros:
+                warnings.warn(
+                    f"{estouros} de {n} resultados de canhoneamento não cabem em "
+                    f"{self.precisao} (em geral Sp com phasing 180°); use precisao=\"float64\".",
+                    PrecisaoInsuficiente,
+                    stacklevel=2,
+                )
+        return saida
+
+    def _constante(self, destino, oleo, valor_0, valor_180):
+        destino.fill(valor_180)
+        np.copyto(destino, valor_0, where=oleo)
+        return destino
+
+    def _Sp(self, c, oleo, hd, rpd, Sp, m):
+        C0, C180 = cv.CONSTANTES_SP[0], cv.CONSTANTES_SP[180]
+        coef = self._buffer("coef", m)
+        a, b, t = self._buffer("a", m), self._buffer("b", m), self._buffer("t2", m)
+        # Sh = ln(4 rw / lp)
+        np.multiply(c["rw"], 4, out=Sp)
+        Sp /= c["lp"]
+        np.log(Sp, out=Sp)
+        # Swb = C1 exp(C2 rwD), rwD = rw / (lp + rw)
+        if self.dtype == np.float64:
+            np.add(c["lp"], c["rw"], out=t)
+            np.divide(c["rw"], t, out=t)
+            t *= self._constante(coef, oleo, C0[1], C180[1])
+            np.exp(t, out=t)
+            t *= self._constante(coef, oleo, C0[0], C180[0])
+        else:
+            # exp(532 rwD) estoura float32 antes de C1 trazê-lo de volta
+            t64 = self._buffer("t64", m, np.dtype(np.float64))
+            coef64 = self._buffer("coef64", m, np.dtype(np.float64))
+            np.add(c["lp"], c["rw"], out=t64)
+            np.divide(c["rw"], t64, out=t64)
+            t64 *= self._constante(coef64, oleo, C0[1], C180[1])
+            np.exp(t64, out=t64)
+            t64 *= self._constante(coef64, oleo, C0[0], C180[0])
+            with np.errstate(over="ignore"):
+                np.copyto(t, t64, casting="same_kind")
+        Sp += t
+        # a = a1 ln(rpd) + a2; b = b1 rpd + b2
+        np.log(rpd, out=a)
+        a *= self._constante(coef, oleo, C0[2], C180[2])
+        a += self._constante(coef, oleo, C0[3], C180[3])
+        np.multiply(self._constante(coef, oleo, C0[4], C180[4]), rpd, out=b)
+        b += self._constante(coef, oleo, C0[5], C180[5])
+        # Sv = 10**a * hd**(b - 1) * rpd**b
+        np.power(10, a, out=a)
+        np.subtract(b, 1, out=t)
+        np.power(hd, t, out=t)
+        a *= t
+        np.power(rpd, b, out=t)
+        a *= t
+        Sp += a
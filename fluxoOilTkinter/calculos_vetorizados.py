@@ -0,0 +1,155 @@
+import numpy as np
+
+# Versões vetorizadas das fórmulas de app.py (FluxoOilCalculator e funções de
+# canhoneamento). Recebem colunas já convertidas para unidades de campo
+# (ver unidades.py) e já validadas (ver validacao.py): não há verificação de
+# divisores aqui, para que os laços numéricos fiquem livres de desvios.
+# A precisão de saída acompanha a das colunas (float64 ou float32).
+
+# Constantes de Sp por phasing: C1, C2, a1, a2, b1, b2
+CONSTANTES_SP = {
+    0: (0.16, 2.675, -2.091, 0.0453, 5.1313, 1.867),
+    180: (0.026, 532.0, -2.0251, 0.0943, 3.073, 1.8115),
+}
+
+
+def calcular_qo(ko, h, pr, pw, uo, Bo, re, rw):
+    return (0.00708 * ko * h * (pr - pw)) / (uo * Bo * np.log(0.472 * re / rw))
+
+
+def calcular_skin(ko, kd, rd, rw):
+    return ((ko / kd) - 1) * np.log(rd / rw)
+
+
+def calcular_qo_alternativo(ko, h, pr, pw, uo, Bo, re, rw, S):
+    return (0.00708 * ko * h * (pr - pw)) / (uo * Bo * (np.log(0.472 * re / rw) + S))
+
+
+def calcular_deltaP(qo, Bo, uo, L, A, ko):
+    return (qo * Bo * uo * L) / (0.00127 * A * ko)
+
+
+def calcular_eficiencia(re, rw, S):
+    ln_part = np.log(0.472 * re / rw)
+    return ln_part / (ln_part + S)
+
+
+def calcular_ip(q1, Pe, pwf):
+    return q1 / (Pe - pwf)
+
+
+def calcular_ii(q1, Pe, pwf):
+    return q1 / (pwf - Pe)
+
+
+def calcular_qc(q1, Pe, pwf1, psat):
+    qsat = calcular_ip(q1, Pe, pwf1) * (Pe - psat)
+    return (qsat * psat) / (1.8 * (Pe - psat))
+
+
+def criar_curva(qc, Pe, Psat, Pwfx):
+    # Curva de Vogel: uma linha por poço (qc, Pe, Psat) e uma coluna por Pwfx
+    qc, Pe, Psat = (np.asarray(x, dtype=np.float64)[..., np.newaxis] for x in (qc, Pe, Psat))
+    Pwfx = np.asarray(Pwfx, dtype=np.float64)
+    return qc * (1.8 * (Pe / Psat) - 0.8 - 0.2 * (Pwfx / Psat) - 0.8 * (Pwfx / Psat) ** 2)
+
+
+def calcular_fluxo(colunas: dict) -> dict:
+    # Equivalente vetorizado de adicionar_poco
+    ko, h, pr, pw = colunas["ko"], colunas["h"], colunas["pr"], colunas["pw"]
+    uo, Bo, re, rw = colunas["uo"], colunas["Bo"], colunas["re"], colunas["rw"]
+    fluxo = calcular_qo(ko, h, pr, pw, uo, Bo, re, rw)
+    skin = calcular_skin(ko, colunas["kd"], colunas["rd"], rw)
+    return {
+        "fluxo": fluxo,
+        "skin": skin,
+        "fluxo_S": calcular_qo_alternativo(ko, h, pr, pw, uo, Bo, re, rw, skin),
+        "deltaP": calcular_deltaP(fluxo, Bo, uo, colunas["L"], colunas["A"], ko),
+        "Eficiência(FE)": calcular_eficiencia(re, rw, skin),
+    }
+
+
+def calcular_produtividade(colunas: dict) -> dict:
+    # Equivalente vetorizado de adicionar_poco_ip
+    q1, Pe, pwf = colunas["q1"], colunas["Pe"], colunas["pwf"]
+    return {"ip": calcular_ip(q1, Pe, pwf), "ii": calcular_ii(q1, Pe, pwf)}
+
+
+def _tipo(x):
+    # Tipo de ponto flutuante das colunas; entradas inteiras viram float64
+    tipo = np.asarray(x).dtype
+    return tipo if np.issubdtype(tipo, np.floating) else np.dtype(np.float64)
+
+
+def calcular_deltaP_canh(k, phasing):
+    return 3000 / (k ** np.where(phasing == 0, 0.37, 0.4).astype(_tipo(k), copy=False))
+
+
+def calcular_hd(h, lp, kh=1.0, kv=1.0):
+    return (h / lp) * np.sqrt(np.asarray(kh / kv, dtype=_tipo(h)))
+
+
+def calcular_rpd(rp, h, kh=1.0, kv=1.0):
+    return (rp / (2 * h)) * (1 + np.sqrt(np.asarray(kv / kh, dtype=_tipo(h))))
+
+
+def calcular_rwD(rw, lp):
+    return rw / (lp + rw)
+
+
+def constantes_sp(phasing):
+    # Seleciona, elemento a elemento, as constantes de 0° ou 180°
+    oleo = np.asarray(phasing) == 0
+    tipo = _tipo(phasing)
+    return tuple(
+        np.where(oleo, c0, c180).astype(tipo, copy=False)
+        for c0, c180 in zip(CONSTANTES_SP[0], CONSTANTES_SP[180])
+    )
+
+
+def calcular_Sp(rw, lp, hd, rpd, phasing):
+    C1, C2, a1, a2, b1, b2 = constantes_sp(phasing)
+    rwD = calcular_rwD(rw, lp)
+    Sh = np.log(4 * rw / lp)
+    Swb = C1 * np.exp(C2 * rwD)
+    a = a1 * np.log(rpd) + a2
+    b = b1 * rpd + b2
+    Sv = (10 ** a) * (hd ** (b - 1)) * (rpd ** b)
+    Sp = Sh + Swb + Sv
+    return Sp, Sh, Swb, Sv, a, b
+
+
+def calcular_Sx(rd, rw, lp):
+    ratio = rd / (rw + lp)
+    return np.select(
+        [ratio >= 18, ratio >= 2, ratio >= 1.5],
+        [0.0, -0.001, -0.002],
+        default=-0.0024,
+    ).astype(_tipo(ratio), copy=False)
+
+
+def calcular_Sdp(Sp, Sx):
+    return Sp + Sx
+
+
+def calcular_canhoneamento(colunas: dict) -> dict:
+    # Equivalente vetorizado de processar_canhoneamento
+    rw, lp, phasing, h = colunas["rw"], colunas["lp"], colunas["phasing"], colunas["h"]
+    hd = calcular_hd(h, lp)
+    rpd = calcular_rpd(colunas["rp"], h)
+    Sp, Sh, Swb, Sv, a, b = calcular_Sp(rw, lp, hd, rpd, phasing)
+    Sx = calcular_Sx(colunas["rd"], rw, lp)
+    return {
+        "deltaP": calcular_deltaP_canh(colunas["k"], phasing),
+        "hd": hd,
+        "rpd": rpd,
+        "rwD": calcular_rwD(rw, lp),
+        "Sh": Sh,
+        "Swb": Swb,
+        "Sv": Sv,
+        "Sp": Sp,
+        "Sx": Sx,
+        "Sdp": calcular_Sdp(Sp, Sx),
+        "a": a,
+        "b": b,
+    }
@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from servico import ServicoCalculo
+
+# Gerador de carga para servico.py: várias conexões keep-alive enviando
+# requisições pequenas em laço, medindo latência p50/p99 e vazão no cliente.
+
+
+def registro_fluxo(rng: random.Random) -> dict:
+    return {
+        "ko": rng.uniform(10, 500), "h": rng.uniform(10, 100),
+        "pr": rng.uniform(2000, 5000), "pw": rng.uniform(500, 1900),
+        "uo": rng.uniform(0.5, 5), "Bo": rng.uniform(1.0, 1.5),
+        "re": rng.uniform(500, 2000), "rw": rng.uniform(0.25, 0.5),
+        "L": rng.uniform(10, 100), "A": rng.uniform(1, 10),
+        "rd": rng.uniform(0.5, 3), "kd": rng.uniform(1, 50),
+    }
+
+
+def registro_produtividade(rng: random.Random) -> dict:
+    return {"q1": rng.uniform(100, 2000), "Pe": rng.uniform(3000, 5000), "pwf": rng.uniform(500, 2900)}
+
+
+def registro_canhoneamento(rng: random.Random) -> dict:
+    return {
+        "k": rng.uniform(10, 500), "rw": rng.uniform(3, 6), "lp": rng.uniform(6, 18),
+        "rp": rng.uniform(0.1, 0.4), "phasing": rng.choice([0, 180]),
+        "h": rng.uniform(0.5, 4), "rd": rng.uniform(6, 60),
+    }
+
+
+GERADORES = {
+    "fluxo": registro_fluxo,
+    "produtividade": registro_produtividade,
+    "canhoneamento": registro_canhoneamento,
+}
+
+
+async def cliente(host, porta, etapa, registros_por_req, fim, latencias, contadores, semente):
+    rng = random.Random(semente)
+    gerar = GERADORES[etapa]
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    try:
+        while time.perf_counter() < fim:
+            corpo = json.dumps({"registros": [gerar(rng) for _ in range(registros_por_req)]}).encode()
+            inicio = time.perf_counter()
+            escritor.write(
+                f"POST /{etapa} HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n".encode() + corpo
+            )
+            await escritor.drain()
+            status = int((await leitor.readline()).split()[1])
+            tamanho = 0
+            while True:
+                linha = await leitor.readline()
+                if linha in (b"\r\n", b""):
+                    break
+                if linha.lower().startswith(b"content-length:"):
+                    tamanho = int(linha.split(b":")[1])
+            await leitor.readexactly(tamanho)
+            if status == 200:
+                latencias.append(time.perf_counter() - inicio)
+                contadores["ok"] += 1
+            else:
+                contadores[status] = contadores.get(status, 0) + 1
+                await asyncio.sleep(0.001)
+    finally:
+        escritor.close()
+
+
+async def gerar_carga(host, porta, etapa, conexoes, duracao, registros_por_req, local):
+    servico = None
+    if local:
+        servico = ServicoCalculo(host, 0)
+        await servico.iniciar()
+        porta = servico.porta
+    latencias = []
+    contadores = {"ok": 0}
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    await asyncio.gather(*(
+        cliente(host, porta, etapa, registros_por_req, fim, latencias, contadores, i)
+        for i in range(conexoes)
+    ))
+    decorrido = time.perf_counter() - inicio
+    if servico:
+        lotes = servico.lotes[etapa]
+        print(f"Micro-lotes: {lotes.lotes} | linhas por lote: {lotes.linhas / max(lotes.lotes, 1):.1f}")
+        await servico.parar()
+    print(f"Conexões: {conexoes} | registros/req: {registros_por_req} | duração: {decorrido:.2f} s")
+    print(f"Respostas: {contadores}")
+    print(f"Vazão: {contadores['ok'] / decorrido:.0f} req/s ({contadores['ok'] * registros_por_req / decorrido:.0f} poços/s)")
+    if latencias:
+        p50, p99 = np.percentile(latencias, [50, 99]) * 1000
+        print(f"Latência: p50 = {p50:.2f} ms | p99 = {p99:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerador de carga para o serviço de cálculo")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--etapa", choices=sorted(GERADORES), default="fluxo")
+    parser.add_argument("--conexoes", type=int, default=64)
+    parser.add_argument("--duracao", type=float, default=10.0)
+    parser.add_argument("--registros", type=int, default=1)
+    parser.add_argument("--local", action="store_true", help="sobe o serviço no mesmo processo")
+    args = parser.parse_args()
+    asyncio.run(gerar_carga(
+        args.host, args.porta, args.etapa, args.conexoes, args.duracao, args.registros, args.local
+    ))
+
+
+if __name__ == "__main__":
+    main()
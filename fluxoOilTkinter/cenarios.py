@@ -0,0 +1,138 @@
+import numpy as np
+
+import calculos_vetorizados as cv
+import unidades
+import validacao
+
+# Matriz "e se" de completação: para cada poço, avalia todas as combinações
+# de projeto de canhoneamento (lp, rp, h, phasing) e de resultado de
+# estimulação (kd, rd). O skin de dano (calcular_skin) e o skin de
+# canhoneamento (Sdp = Sp + Sx) são somados e entram juntos em qo e FE:
+#
+#   S_total = S_dano + Sdp
+#   qo      = 0.00708 ko h (pr - pw) / (uo Bo (ln(0.472 re / rw) + S_total))
+#   FE      = ln(0.472 re / rw) / (ln(0.472 re / rw) + S_total)
+#
+# Eixos do resultado: (poço, projeto, estimulação). Poços em unidades de
+# campo (ft); projetos em polegadas, como na aba de Canhoneamento; rd da
+# estimulação em ft.
+
+COLUNAS_POCOS = ("ko", "h", "pr", "pw", "uo", "Bo", "re", "rw")
+COLUNAS_PROJETOS = ("lp", "rp", "h", "phasing")
+COLUNAS_ESTIMULACOES = ("kd", "rd")
+
+# Limite de elementos (poços x projetos x estimulações) por bloco de poços
+ELEMENTOS_POR_BLOCO = 1 << 22
+
+_FT_PARA_IN = unidades.fator_conversao("comprimento", "ft", "in")
+
+
+def _colunas(dados: dict, nomes, descricao: str) -> dict:
+    faltando = [n for n in nomes if n not in dados]
+    if faltando:
+        raise ValueError(f"Colunas ausentes em {descricao}: {', '.join(faltando)}.")
+    return {n: np.asarray(dados[n], dtype=np.float64).ravel() for n in nomes}
+
+
+def _pares_invalidos(p: dict, e: dict) -> np.ndarray:
+    # Cada par (poço, estimulação) passa pela triagem do fluxo; L e A não
+    # entram nos cenários e valem 1 para não marcar nada por conta própria
+    n, s = p["ko"].size, e["kd"].size
+    pares = {nome: np.repeat(p[nome], s) for nome in COLUNAS_POCOS}
+    pares["kd"] = np.tile(e["kd"], n)
+    pares["rd"] = np.tile(e["rd"], n)
+    pares["L"] = pares["A"] = np.ones(n * s)
+    invalidos = (validacao.validar_fluxo(pares) != 0) | ~(pares["kd"] > 0)
+    return invalidos.reshape(n, 1, s)
+
+
+def _projetos_invalidos(c: dict) -> np.ndarray:
+    # Triagem do canhoneamento só com as colunas do projeto; k, rw e rd vêm
+    # dos poços e das estimulações, já conferidos em _pares_invalidos
+    um = np.ones(c["lp"].size)
+    colunas = {**c, "k": um, "rw": um, "rd": um}
+    return (validacao.validar_canhoneamento(colunas) != 0)[None, :, None]
+
+
+def matriz_cenarios(pocos: dict, projetos: dict, estimulacoes: dict) -> dict:
+    """
+    Avalia todos os cenários de uma vez por broadcasting e devolve matrizes
+    (poço, projeto, estimulação) de S_dano, Sdp, S_total, qo e FE. Cenários
+    inválidos ficam com qo e FE iguais a NaN, sem interromper os demais:
+    pares (poço, estimulação) rejeitados por validacao.validar_fluxo ou com
+    kd <= 0, projetos rejeitados por validacao.validar_canhoneamento,
+    ln(0.472 re/rw) + S_total <= 0 e resultados não finitos.
+    """
+    p = _colunas(pocos, COLUNAS_POCOS, "poços")
+    c = _colunas(projetos, COLUNAS_PROJETOS, "projetos")
+    e = _colunas(estimulacoes, COLUNAS_ESTIMULACOES, "estimulações")
+
+    # Eixos: poço (n, 1, 1), projeto (1, m, 1), estimulação (1, 1, s)
+    ko, h, pr, pw, uo, Bo, re, rw = (p[n][:, None, None] for n in COLUNAS_POCOS)
+    lp, rp, h_canh, phasing = (c[n][None, :, None] for n in COLUNAS_PROJETOS)
+    kd, rd = (e[n][None, None, :] for n in COLUNAS_ESTIMULACOES)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        S_dano = cv.calcular_skin(ko, kd, rd, rw)
+        rw_in = rw * _FT_PARA_IN
+        hd = cv.calcular_hd(h_canh, lp)
+        rpd = cv.calcular_rpd(rp, h_canh)
+        Sp = cv.calcular_Sp(rw_in, lp, hd, rpd, phasing)[0]
+        Sx = cv.calcular_Sx(rd * _FT_PARA_IN, rw_in, lp)
+        Sdp = cv.calcular_Sdp(Sp, Sx)
+        S_total = S_dano + Sdp
+        ln_part = np.log(0.472 * re / rw)
+        qo = cv.calcular_qo_alternativo(ko, h, pr, pw, uo, Bo, re, rw, S_total)
+        FE = cv.calcular_eficiencia(re, rw, S_total)
+        invalidos = (
+            _pares_invalidos(p, e)
+            | _projetos_invalidos(c)
+            | ~(ln_part + S_total > 0)
+            | ~np.isfinite(qo)
+            | ~np.isfinite(FE)
+        )
+    qo = np.where(invalidos, np.nan, qo)
+    FE = np.where(invalidos, np.nan, FE)
+    forma = qo.shape
+    return {
+        "S_dano": np.broadcast_to(S_dano, forma),
+        "Sdp": np.broadcast_to(Sdp, forma),
+        "S_total": S_total,
+        "qo": qo,
+        "FE": FE,
+    }
+
+
+def melhor_cenario(pocos: dict, projetos: dict, estimulacoes: dict, criterio: str = "qo") -> dict:
+    """
+    Melhor cenário de cada poço pelo critério ("qo" ou "FE"). Os poços são
+    processados em blocos para limitar a memória das matrizes intermediárias.
+    Devolve, por poço, os índices do projeto e da estimulação escolhidos e
+    os valores de qo, FE, S_dano, Sdp e S_total nesse cenário; poços sem
+    cenário válido ficam com índices -1 e valores NaN.
+    """
+    if criterio not in ("qo", "FE"):
+        raise ValueError("Critério deve ser 'qo' ou 'FE'.")
+    n = np.asarray(pocos["ko"]).size
+    m = np.asarray(projetos["lp"]).size
+    s = np.asarray(estimulacoes["kd"]).size
+    saida = {
+        "projeto": np.full(n, -1, dtype=np.int64),
+        "estimulacao": np.full(n, -1, dtype=np.int64),
+        **{nome: np.full(n, np.nan) for nome in ("qo", "FE", "S_dano", "Sdp", "S_total")},
+    }
+    bloco = max(1, ELEMENTOS_POR_BLOCO // max(m * s, 1))
+    for inicio in range(0, n, bloco):
+        fatia = slice(inicio, min(inicio + bloco, n))
+        parte = {nome: np.asarray(pocos[nome])[fatia] for nome in COLUNAS_POCOS}
+        matriz = matriz_cenarios(parte, projetos, estimulacoes)
+        valores = matriz[criterio].reshape(-1, m * s)
+        com_cenario = ~np.all(np.isnan(valores), axis=1)
+        melhor = np.argmax(np.where(np.isnan(valores), -np.inf, valores), axis=1)
+        linhas = np.arange(valores.shape[0])
+        destino = np.arange(inicio, fatia.stop)[com_cenario]
+        saida["projeto"][destino] = (melhor // s)[com_cenario]
+        saida["estimulacao"][destino] = (melhor % s)[com_cenario]
+        for nome in ("qo", "FE", "S_dano", "Sdp", "S_total"):
+            saida[nome][destino] = matriz[nome].reshape(-1, m * s)[linhas, melhor][com_cenario]
+    return saida
@@ -0,0 +1,253 @@
+import glob
+import json
+import os
+import time
+import zipfile
+
+import numpy as np
+
+# Diário somente-anexação das ações do aplicativo. Cada registro guarda a
+# operação e os dados completos do poço (entradas e resultados já
+# calculados), então a reconstrução de um estado passado só reaplica
+# inserções e remoções em listas, sem recalcular nenhuma fórmula.
+#
+#   diario.jsonl                 um registro JSON por linha: seq, t, op, dados
+#   snapshot_<seq>_<ms>.npz      estado após o registro <seq>: um array por
+#                                campo de cada esquema (conjunto de campos),
+#                                o esquema de cada linha e, em "meta", os
+#                                nomes dos campos e a posição (em bytes) do
+#                                registro seguinte no diário
+#
+# Cada registro é entregue ao sistema operacional assim que é gravado (flush),
+# então sobrevive a uma queda do aplicativo. Só o fsync, que protege contra
+# queda do sistema, é agrupado: acontece a cada `fsync_a_cada` registros ou
+# quando um registro chega `intervalo_fsync` segundos após o último fsync.
+
+LISTAS = ("poços", "i_pocos", "ranking_canh")
+
+# operação -> (lista afetada, ação)
+OPERACOES = {
+    "inicio_sessao": (None, "limpar_tudo"),
+    "adicionar_poco": ("poços", "adicionar"),
+    "apagar_poco": ("poços", "apagar"),
+    "limpar_ranking": ("poços", "limpar"),
+    "adicionar_poco_ip": ("i_pocos", "adicionar"),
+    "apagar_poco_ip": ("i_pocos", "apagar"),
+    "limpar_ranking_ip": ("i_pocos", "limpar"),
+    "processar_canhoneamento": ("ranking_canh", "adicionar"),
+    "limpar_ranking_canh": ("ranking_canh", "limpar"),
+}
+
+# Critério de ordenação de cada ranking, igual ao das tabelas do aplicativo
+CHAVES_RANKING = {"poços": "fluxo", "i_pocos": "ip", "ranking_canh": "Sdp"}
+
+
+class DiarioCorrompido(ValueError):
+    """Registro ilegível no meio do diário (não é a última linha incompleta)."""
+
+
+def estado_vazio() -> dict:
+    return {lista: [] for lista in LISTAS}
+
+
+def aplicar(estado: dict, registro: dict):
+    if registro["op"] not in OPERACOES:
+        raise ValueError(f"Operação desconhecida no diário: '{registro['op']}'.")
+    lista, acao = OPERACOES[registro["op"]]
+    if acao == "limpar_tudo":
+        for nome in LISTAS:
+            estado[nome].clear()
+    elif acao == "adicionar":
+        estado[lista].append(registro["dados"])
+    elif acao == "apagar":
+        nome = registro["dados"]["nome"]
+        estado[lista][:] = [p for p in estado[lista] if p["nome"] != nome]
+    else:
+        estado[lista].clear()
+
+
+# Tipos Python guardados como colunas nativas no snapshot
+TIPOS_NATIVOS = {float: np.float64, str: np.str_, bool: np.bool_, int: np.int64}
+
+
+def _coluna(valores: list):
+    # Array nativo quando todos os valores têm o mesmo tipo simples; senão
+    # (tipos misturados, None, listas...) cada valor vai como texto JSON
+    tipos = set(map(type, valores))
+    tipo = TIPOS_NATIVOS.get(tipos.pop()) if len(tipos) == 1 else None
+    if tipo is not None:
+        try:
+            return np.array(valores, dtype=tipo), False
+        except OverflowError:
+            pass
+    return np.array([json.dumps(v, ensure_ascii=False) for v in valores], dtype=np.str_), True
+
+
+def _compactar(estado: dict):
+    # Devolve (meta, arrays) para o .npz; os arrays são nomeados por posição,
+    # e os nomes dos campos ficam em meta
+    meta, arrays = {}, {}
+    for i, (lista, pocos) in enumerate(estado.items()):
+        esquemas, linhas, valores = {}, [], []
+        for poco in pocos:
+            indice = esquemas.setdefault(tuple(poco), len(esquemas))
+            if indice == len(valores):
+                valores.append([])
+            linhas.append(indice)
+            valores[indice].append(poco.values())
+        meta[lista] = {"esquemas": [list(campos) for campos in esquemas], "json": []}
+        arrays[f"l{i}"] = np.array(linhas, dtype=np.int32)
+        for indice, campos in enumerate(esquemas):
+            for j, coluna in enumerate(zip(*valores[indice])):
+                chave = f"l{i}_e{indice}_c{j}"
+                arrays[chave], em_json = _coluna(list(coluna))
+                if em_json:
+                    meta[lista]["json"].append(chave)
+    return meta, arrays
+
+
+def _expandir(meta: dict, arrays) -> dict:
+    estado = {}
+    for i, (lista, dados) in enumerate(meta.items()):
+        em_json = set(dados["json"])
+        linhas_esquema = []
+        for indice, campos in enumerate(dados["esquemas"]):
+            colunas = []
+            for j in range(len(campos)):
+                chave = f"l{i}_e{indice}_c{j}"
+                coluna = arrays[chave].tolist()
+                colunas.append([json.loads(v) for v in coluna] if chave in em_json else coluna)
+            linhas_esquema.append(iter([dict(zip(campos, linha)) for linha in zip(*colunas)]))
+        estado[lista] = [next(linhas_esquema[indice]) for indice in arrays[f"l{i}"].tolist()]
+    return estado
+
+
+def rankings(estado: dict) -> dict:
+    return {
+        lista: sorted(estado[lista], key=lambda p: p[chave], reverse=True)
+        for lista, chave in CHAVES_RANKING.items()
+    }
+
+
+class DiarioCalculos:
+    def __init__(
+        self,
+        diretorio: str,
+        fsync_a_cada: int = 32,
+        intervalo_fsync: float = 1.0,
+        snapshot_a_cada: int = 1000,
+    ):
+        os.makedirs(diretorio, exist_ok=True)
+        self.diretorio = diretorio
+        self.caminho = os.path.join(diretorio, "diario.jsonl")
+        self.fsync_a_cada = fsync_a_cada
+        self.intervalo_fsync = intervalo_fsync
+        self.snapshot_a_cada = snapshot_a_cada
+        # Retoma o estado e a numeração a partir do que já está em disco
+        self.estado, self.seq, posicao = _reproduzir(diretorio)
+        if os.path.exists(self.caminho) and os.path.getsize(self.caminho) > posicao:
+            # Descarta uma linha incompleta deixada por uma queda
+            with open(self.caminho, "r+b") as f:
+                f.truncate(posicao)
+        self.arquivo = open(self.caminho, "ab")
+        self.pendentes = 0
+        self.ultimo_fsync = time.monotonic()
+        self.desde_snapshot = 0
+
+    def registrar(self, op: str, dados: dict | None = None) -> int:
+        registro = {"seq": self.seq + 1, "t": time.time(), "op": op, "dados": dados or {}}
+        aplicar(self.estado, registro)
+        self.arquivo.write(json.dumps(registro, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.arquivo.flush()
+        self.seq += 1
+        self.pendentes += 1
+        self.desde_snapshot += 1
+        if self.pendentes >= self.fsync_a_cada or time.monotonic() - self.ultimo_fsync >= self.intervalo_fsync:
+            self.sincronizar()
+        if self.desde_snapshot >= self.snapshot_a_cada:
+            self.snapshot()
+        return self.seq
+
+    def sincronizar(self):
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+        self.pendentes = 0
+        self.ultimo_fsync = time.monotonic()
+
+    def snapshot(self):
+        # O snapshot só é gravado depois que o diário até ele está em disco
+        self.sincronizar()
+        agora = time.time()
+        estado, arrays = _compactar(self.estado)
+        meta = {"seq": self.seq, "t": agora, "posicao": self.arquivo.tell(), "estado": estado}
+        destino = os.path.join(self.diretorio, f"snapshot_{self.seq:012d}_{int(agora * 1000)}.npz")
+        temporario = destino + ".tmp"
+        with open(temporario, "wb") as f:
+            np.savez(f, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, destino)
+        self.desde_snapshot = 0
+
+    def fechar(self):
+        if not self.arquivo.closed:
+            self.sincronizar()
+            self.arquivo.close()
+
+
+def _snapshots(diretorio: str) -> list:
+    return sorted(glob.glob(os.path.join(diretorio, "snapshot_*.npz")))
+
+
+def _reproduzir(diretorio: str, ate_seq: int | None = None, ate_tempo: float | None = None):
+    estado, seq, posicao = estado_vazio(), 0, 0
+    # Snapshot mais recente que não ultrapassa o ponto pedido; um snapshot
+    # ilegível é ignorado e o anterior (ou o diário desde o início) é usado
+    for caminho in reversed(_snapshots(diretorio)):
+        try:
+            seq_snapshot, ms_snapshot = (int(v) for v in os.path.basename(caminho)[9:-4].split("_"))
+        except ValueError:
+            continue
+        if ate_seq is not None and seq_snapshot > ate_seq:
+            continue
+        if ate_tempo is not None and ms_snapshot > ate_tempo * 1000:
+            continue
+        try:
+            with np.load(caminho, allow_pickle=False) as arrays:
+                meta = json.loads(str(arrays["meta"]))
+                estado = _expandir(meta["estado"], arrays)
+        except (OSError, ValueError, KeyError, StopIteration, zipfile.BadZipFile):
+            continue
+        seq, posicao = meta["seq"], meta["posicao"]
+        break
+
+    caminho = os.path.join(diretorio, "diario.jsonl")
+    if not os.path.exists(caminho):
+        return estado, seq, posicao
+    with open(caminho, "rb") as f:
+        f.seek(posicao)
+        for linha in f:
+            if not linha.endswith(b"\n"):
+                # Última linha incompleta (queda antes do fsync)
+                break
+            try:
+                registro = json.loads(linha)
+                if ate_seq is not None and registro["seq"] > ate_seq:
+                    break
+                if ate_tempo is not None and registro["t"] > ate_tempo:
+                    break
+                aplicar(estado, registro)
+            except (ValueError, KeyError, TypeError) as e:
+                raise DiarioCorrompido(f"Registro inválido em {caminho}, byte {posicao}: {e}") from None
+            seq = registro["seq"]
+            posicao += len(linha)
+    return estado, seq, posicao
+
+
+def reconstruir(diretorio: str, ate_seq: int | None = None, ate_tempo: float | None = None) -> dict:
+    """
+    Estado das listas do aplicativo logo após o registro `ate_seq` ou no
+    instante `ate_tempo` (time.time()); sem limites, o estado mais recente.
+    """
+    estado, _, _ = _reproduzir(diretorio, ate_seq, ate_tempo)
+    return estado
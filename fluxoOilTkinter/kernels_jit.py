@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+
+import calculos_vetorizados as cv
+
+# Núcleos compilados (Numba) para as fórmulas mais encadeadas: calcular_Sp
+# (log, exp e potências somadas em Sh + Swb + Sv) e a curva de Vogel de
+# criar_curva. Cada fórmula vira um único laço paralelo, sem os vetores
+# temporários que a versão NumPy cria a cada operação. Sem Numba instalado,
+# os mesmos nomes caem para as versões de calculos_vetorizados.py.
+# As operações seguem a mesma ordem da referência; as diferenças vêm só de
+# exp/log/pow (poucos ULPs por termo), mas em Sp o cancelamento entre Sh e
+# Swb as amplifica (limite derivado por elemento em bench_kernels.py).
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_DISPONIVEL = numba is not None
+BACKENDS = ("numpy", "numba") if NUMBA_DISPONIVEL else ("numpy",)
+
+
+if NUMBA_DISPONIVEL:
+    _C0 = cv.CONSTANTES_SP[0]
+    _C180 = cv.CONSTANTES_SP[180]
+
+    @numba.njit(parallel=True, fastmath=False, cache=True)
+    def _Sp_numba(rw, lp, hd, rpd, phasing, out):
+        for i in numba.prange(rw.shape[0]):
+            if phasing[i] == 0:
+                C1, C2, a1, a2, b1, b2 = _C0
+            else:
+                C1, C2, a1, a2, b1, b2 = _C180
+            rwD = rw[i] / (lp[i] + rw[i])
+            Sh = math.log(4 * rw[i] / lp[i])
+            Swb = C1 * math.exp(C2 * rwD)
+            a = a1 * math.log(rpd[i]) + a2
+            b = b1 * rpd[i] + b2
+            Sv = (10.0 ** a) * (hd[i] ** (b - 1)) * (rpd[i] ** b)
+            out[i] = Sh + Swb + Sv
+        return out
+
+    @numba.njit(parallel=True, fastmath=False, cache=True)
+    def _curva_numba(qc, Pe, Psat, Pwfx, out):
+        for i in numba.prange(qc.shape[0]):
+            base = 1.8 * (Pe[i] / Psat[i]) - 0.8
+            for j in range(Pwfx.shape[0]):
+                razao = Pwfx[j] / Psat[i]
+                out[i, j] = qc[i] * (base - 0.2 * razao - 0.8 * razao ** 2)
+        return out
+
+
+def _backend(backend):
+    if backend is None:
+        return BACKENDS[-1]
+    if backend not in ("numpy", "numba"):
+        raise ValueError(f"Backend desconhecido: '{backend}'.")
+    if backend == "numba" and not NUMBA_DISPONIVEL:
+        raise ValueError("Backend 'numba' indisponível: instale o pacote numba.")
+    return backend
+
+
+def _vetores(*valores):
+    return [np.ascontiguousarray(v, dtype=np.float64) for v in np.broadcast_arrays(*valores)]
+
+
+def calcular_Sp(rw, lp, hd, rpd, phasing, backend: str | None = None, out=None) -> np.ndarray:
+    # Retorna apenas Sp; os termos intermediários continuam em cv.calcular_Sp
+    if _backend(backend) == "numpy":
+        Sp = cv.calcular_Sp(rw, lp, hd, rpd, phasing)[0]
+        if out is None:
+            return Sp
+        out[...] = Sp
+        return out
+    rw, lp, hd, rpd, phasing = _vetores(rw, lp, hd, rpd, phasing)
+    if out is None:
+        out = np.empty_like(rw)
+    return _Sp_numba(rw, lp, hd, rpd, phasing, out)
+
+
+def criar_curva(qc, Pe, Psat, Pwfx, backend: str | None = None, out=None) -> np.ndarray:
+    if _backend(backend) == "numpy":
+        curva = cv.criar_curva(qc, Pe, Psat, Pwfx)
+        if out is None:
+            return curva
+        out[...] = curva
+        return out
+    qc, Pe, Psat = _vetores(np.atleast_1d(qc), Pe, Psat)
+    Pwfx = np.ascontiguousarray(Pwfx, dtype=np.float64)
+    if out is None:
+        out = np.empty((qc.shape[0], Pwfx.shape[0]))
+    return _curva_numba(qc, Pe, Psat, Pwfx, out)
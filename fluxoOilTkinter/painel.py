@@ -0,0 +1,186 @@
+import numpy as np
+
+import unidades
+import validacao
+from calculo_em_blocos import CalculadoraBlocos
+
+# Painel agregado do campo: skin x FE, qo x qo com S e distribuição de Sdp
+# para a carteira inteira. Os dados são binados uma única vez numa grade fina
+# (RESOLUCAO_BASE); cada redesenho só reagrupa essa grade para a resolução da
+# tela, de modo que o custo de desenhar depende dos pixels, e não do número
+# de poços. A dispersão mostra no máximo um ponto representativo por pixel.
+
+RESOLUCAO_BASE = 1024
+BINS_BASE_1D = 4096
+# Percentis usados como limites dos eixos, para que poucos valores extremos
+# (por exemplo, Sp com phasing 180) não achatem o restante da carteira
+PERCENTIS_LIMITES = (0.1, 99.9)
+
+
+def _limites(valores: np.ndarray):
+    inferior, superior = np.percentile(valores, PERCENTIS_LIMITES)
+    if inferior == superior:
+        inferior, superior = inferior - 0.5, superior + 0.5
+    return float(inferior), float(superior)
+
+
+def _celulas(valores: np.ndarray, limites, resolucao: int) -> np.ndarray:
+    inferior, superior = limites
+    indices = ((valores - inferior) * (resolucao / (superior - inferior))).astype(np.int64)
+    return np.clip(indices, 0, resolucao - 1)
+
+
+def _reagrupar(contagens: np.ndarray, n: int, eixo: int) -> np.ndarray:
+    # Soma blocos contíguos da grade fina até sobrarem n bins no eixo
+    bordas = np.linspace(0, contagens.shape[eixo], n + 1).astype(np.int64)[:-1]
+    return np.add.reduceat(contagens, np.unique(bordas), axis=eixo)
+
+
+class Agregado2D:
+    def __init__(self, x, y, resolucao: int = RESOLUCAO_BASE):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        finitos = np.isfinite(x) & np.isfinite(y)
+        x, y = x[finitos], y[finitos]
+        self.resolucao = resolucao
+        self.total = x.shape[0]
+        self.excluidos = finitos.shape[0] - self.total
+        if not self.total:
+            self.limites_x = self.limites_y = (0.0, 1.0)
+            self.contagens = np.zeros((resolucao, resolucao), dtype=np.int64)
+            self.celulas = np.zeros(0, dtype=np.int64)
+            self.rep_x = self.rep_y = np.zeros(0)
+            return
+        self.limites_x, self.limites_y = _limites(x), _limites(y)
+        ix = _celulas(x, self.limites_x, resolucao)
+        iy = _celulas(y, self.limites_y, resolucao)
+        celula = ix * resolucao + iy
+        self.contagens = np.bincount(celula, minlength=resolucao * resolucao).reshape(resolucao, resolucao)
+        # Um poço representativo por célula ocupada da grade fina
+        self.celulas, primeiro = np.unique(celula, return_index=True)
+        self.rep_x, self.rep_y = x[primeiro], y[primeiro]
+
+    def histograma(self, nx: int, ny: int) -> np.ndarray:
+        nx, ny = min(nx, self.resolucao), min(ny, self.resolucao)
+        return _reagrupar(_reagrupar(self.contagens, nx, 0), ny, 1)
+
+    def dispersao(self, nx: int, ny: int):
+        ix = (self.celulas // self.resolucao) * nx // self.resolucao
+        iy = (self.celulas % self.resolucao) * ny // self.resolucao
+        _, escolhidos = np.unique(ix * ny + iy, return_index=True)
+        return self.rep_x[escolhidos], self.rep_y[escolhidos]
+
+
+class Agregado1D:
+    def __init__(self, valores, bins: int = BINS_BASE_1D):
+        valores = np.asarray(valores, dtype=np.float64)
+        finitos = np.isfinite(valores)
+        valores = valores[finitos]
+        self.bins = bins
+        self.total = valores.shape[0]
+        self.excluidos = finitos.shape[0] - self.total
+        self.limites = _limites(valores) if self.total else (0.0, 1.0)
+        self.contagens = np.bincount(_celulas(valores, self.limites, bins), minlength=bins)
+
+    def histograma(self, n: int):
+        contagens = _reagrupar(self.contagens, min(n, self.bins), 0)
+        return contagens, np.linspace(*self.limites, contagens.shape[0] + 1)
+
+
+def _excluidos(agregado) -> str:
+    # Valores não finitos não entram nos gráficos, mas o título avisa
+    return f", {agregado.excluidos} não finitos fora" if agregado.excluidos else ""
+
+
+class PainelCampo:
+    def __init__(self, skin=(), fe=(), qo=(), qo_S=(), Sdp=()):
+        self.skin_fe = Agregado2D(skin, fe)
+        self.qo = Agregado2D(qo, qo_S)
+        self.sdp = Agregado1D(Sdp)
+
+    @classmethod
+    def de_pocos(cls, poços: list, ranking_canh: list = ()):
+        # Monta o painel a partir das listas globais do aplicativo
+        def coluna(lista, chave):
+            return np.fromiter((p[chave] for p in lista), dtype=np.float64, count=len(lista))
+
+        return cls(
+            skin=coluna(poços, "skin"),
+            fe=coluna(poços, "Eficiência(FE)"),
+            qo=coluna(poços, "fluxo"),
+            qo_S=coluna(poços, "fluxo_S"),
+            Sdp=coluna(ranking_canh, "Sdp"),
+        )
+
+    def desenhar(self, fig, largura_px: int, altura_px: int):
+        fig.clear()
+        eixos = fig.subplots(1, 3)
+        # Cada gráfico ocupa cerca de um terço da largura útil
+        nx = max(int(largura_px * 0.25), 8)
+        ny = max(int(altura_px * 0.7), 8)
+
+        ax = eixos[0]
+        contagens = self.skin_fe.histograma(nx, ny).astype(np.float64)
+        contagens[contagens == 0] = np.nan
+        ax.imshow(
+            np.log10(contagens).T, origin="lower", aspect="auto", cmap="viridis",
+            extent=(*self.skin_fe.limites_x, *self.skin_fe.limites_y), interpolation="nearest",
+        )
+        ax.set_xlabel("Skin (S)")
+        ax.set_ylabel("Eficiência (FE)")
+        ax.set_title(
+            f"Skin x FE ({self.skin_fe.total} poços{_excluidos(self.skin_fe)}, log10 da contagem)", fontsize=9
+        )
+
+        ax = eixos[1]
+        x, y = self.qo.dispersao(nx, ny)
+        ax.scatter(x, y, s=1, marker=".", linewidths=0, rasterized=True)
+        ax.set_xlim(*self.qo.limites_x)
+        ax.set_ylim(*self.qo.limites_y)
+        ax.set_xlabel("qo (STB/d)")
+        ax.set_ylabel("qo usando S (STB/d)")
+        ax.set_title(f"qo x qo_S ({x.shape[0]} de {self.qo.total} pontos{_excluidos(self.qo)})", fontsize=9)
+
+        ax = eixos[2]
+        contagens, bordas = self.sdp.histograma(max(nx // 3, 8))
+        ax.stairs(contagens, bordas, fill=True)
+        ax.set_xlabel("Sdp")
+        ax.set_ylabel("Poços")
+        ax.set_title(f"Distribuição de Sdp ({self.sdp.total} resultados{_excluidos(self.sdp)})", fontsize=9)
+        fig.tight_layout()
+
+
+def carregar_carteira(caminho: str, precisao: str = "float64") -> PainelCampo:
+    """
+    Lê uma carteira em .npz com as colunas de unidades.COLUNAS_FLUXO e,
+    opcionalmente, as de canhoneamento com prefixo "canh_" (canh_k, canh_rw,
+    canh_lp, canh_rp, canh_phasing, canh_h, canh_rd). Linhas inválidas são
+    descartadas pela triagem de validacao.py. `precisao` vale só para o
+    fluxo: o canhoneamento é sempre calculado em float64, porque Sp com
+    phasing 180° não cabe em float32 (ver calculo_em_blocos.py). Com
+    "float32", as colunas de fluxo (float64 no .npz, em geral) são
+    convertidas uma vez após a triagem, para que os blocos não precisem
+    de buffers de conversão.
+    """
+    calculadora = CalculadoraBlocos(precisao)
+    with np.load(caminho) as dados:
+        fluxo = {nome: dados[nome] for nome in unidades.COLUNAS_FLUXO}
+        canh = {
+            nome: dados["canh_" + nome]
+            for nome in unidades.COLUNAS_CANHONEAMENTO
+            if "canh_" + nome in dados.files
+        }
+    _, limpos, _ = validacao.separar(fluxo, validacao.validar_fluxo(fluxo))
+    limpos = {nome: coluna.astype(calculadora.dtype, copy=False) for nome, coluna in limpos.items()}
+    resultados = calculadora.fluxo(limpos)
+    Sdp = ()
+    if len(canh) == len(unidades.COLUNAS_CANHONEAMENTO):
+        _, limpos, _ = validacao.separar(canh, validacao.validar_canhoneamento(canh))
+        Sdp = CalculadoraBlocos("float64").canhoneamento(limpos)["Sdp"]
+    return PainelCampo(
+        skin=resultados["skin"],
+        fe=resultados["Eficiência(FE)"],
+        qo=resultados["fluxo"],
+        qo_S=resultados["fluxo_S"],
+        Sdp=Sdp,
+    )
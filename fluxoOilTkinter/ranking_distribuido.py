@@ -0,0 +1,150 @@
+import concurrent.futures
+import heapq
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import validacao
+
+# Ranking de carteiras grandes em fatias. Cada processo valida, calcula e
+# ordena apenas a sua fatia de poços e grava o resultado ordenado em disco
+# (arquivos .npy, que fazem o papel de "nós"); o coordenador faz um merge
+# k-way em fluxo sobre esses arquivos mapeados em memória, lendo um bloco
+# por fatia de cada vez. Assim a memória do coordenador depende de
+# fatias x bloco, e não do total de poços.
+#
+# Uma fatia pode ser um dict de colunas, o caminho de um .npz com as colunas
+# ou uma função sem argumentos (picklable) que devolve o dict de colunas.
+
+# critério -> (etapa de validacao.ETAPAS, resultado usado na ordenação)
+CRITERIOS = {
+    "fluxo": ("fluxo", "fluxo"),
+    "ip": ("produtividade", "ip"),
+    "Sdp": ("canhoneamento", "Sdp"),
+}
+
+
+def _carregar(fatia) -> dict:
+    if callable(fatia):
+        return fatia()
+    if isinstance(fatia, (str, os.PathLike)):
+        with np.load(fatia) as dados:
+            return {nome: dados[nome] for nome in dados.files}
+    return fatia
+
+
+def _pico_rss() -> int | None:
+    # Pico de memória residente deste processo, em bytes (None no Windows)
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico if sys.platform == "darwin" else pico * 1024
+
+
+def ranquear_fatia(fatia, criterio: str, indice: int, diretorio: str, k: int | None = None) -> dict:
+    """
+    Executado em cada processo: calcula a fatia, ordena do maior para o menor
+    (como os rankings do aplicativo) e grava valores, linhas e nomes em
+    `diretorio`. Com `k`, só os k melhores da fatia são gravados.
+    """
+    etapa, chave = CRITERIOS[criterio]
+    validar, calcular = validacao.ETAPAS[etapa]
+    colunas = _carregar(fatia)
+    nomes = colunas.get("nome")
+    codigos = validar(colunas)
+    linhas, limpos, _ = validacao.separar(
+        {nome: valores for nome, valores in colunas.items() if nome != "nome"}, codigos
+    )
+    valores = calcular(limpos)[chave]
+    ordem = np.argsort(-valores, kind="stable")
+    if k is not None:
+        ordem = ordem[:k]
+    base = os.path.join(diretorio, f"fatia_{indice}")
+    np.save(base + "_valores.npy", valores[ordem])
+    np.save(base + "_linhas.npy", linhas[ordem])
+    if nomes is not None:
+        np.save(base + "_nomes.npy", np.asarray(nomes)[linhas[ordem]])
+    return {
+        "indice": indice,
+        "base": base,
+        "poços": int(codigos.shape[0]),
+        "rejeitados": int(np.count_nonzero(codigos)),
+        "nomes": nomes is not None,
+        "pico_rss": _pico_rss(),
+    }
+
+
+def _percorrer(resumo: dict, bloco: int):
+    # Lê a fatia ordenada em blocos; só um bloco por fatia fica em memória
+    valores = np.load(resumo["base"] + "_valores.npy", mmap_mode="r")
+    linhas = np.load(resumo["base"] + "_linhas.npy", mmap_mode="r")
+    nomes = np.load(resumo["base"] + "_nomes.npy", mmap_mode="r") if resumo["nomes"] else None
+    indice = resumo["indice"]
+    try:
+        for inicio in range(0, valores.shape[0], bloco):
+            v = valores[inicio:inicio + bloco].tolist()
+            if nomes is not None:
+                ids = nomes[inicio:inicio + bloco].tolist()
+            else:
+                ids = [(indice, linha) for linha in linhas[inicio:inicio + bloco].tolist()]
+            yield from zip(v, ids)
+    finally:
+        # Solta os mapeamentos antes da remoção dos arquivos: no Windows um
+        # .npy ainda mapeado não pode ser apagado
+        del valores, linhas, nomes
+
+
+def ranking_distribuido(
+    fatias,
+    criterio: str = "fluxo",
+    k: int | None = None,
+    processos: int | None = None,
+    diretorio: str | None = None,
+    bloco: int = 8192,
+    resumos: list | None = None,
+):
+    """
+    Gera (posição, identificador, valor) do maior para o menor valor do
+    critério ("fluxo", "ip" ou "Sdp"). O identificador é o nome do poço,
+    quando a fatia tem a coluna "nome", ou (índice da fatia, linha).
+    Com `k`, para após os k primeiros. Se `resumos` for uma lista, recebe
+    o resumo de cada fatia (poços, rejeitados e pico de RSS do processo).
+    """
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Critério deve ser um de: {', '.join(CRITERIOS)}.")
+    temporario = None
+    if diretorio is None:
+        temporario = tempfile.TemporaryDirectory(prefix="ranking_", ignore_cleanup_errors=True)
+        diretorio = temporario.name
+    fluxos, mesclado = [], None
+    try:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=processos) as executor:
+            futuros = [
+                executor.submit(ranquear_fatia, fatia, criterio, indice, diretorio, k)
+                for indice, fatia in enumerate(fatias)
+            ]
+            resumos_fatias = [futuro.result() for futuro in futuros]
+        if resumos is not None:
+            resumos.extend(resumos_fatias)
+        fluxos = [_percorrer(resumo, bloco) for resumo in resumos_fatias]
+        mesclado = heapq.merge(*fluxos, key=lambda item: item[0], reverse=True)
+        for posicao, (valor, identificador) in enumerate(mesclado, start=1):
+            if k is not None and posicao > k:
+                break
+            yield posicao, identificador, valor
+    finally:
+        # Fecha o merge e cada leitura (mesmo após um break do chamador)
+        # para liberar os arquivos mapeados antes da limpeza
+        if mesclado is not None:
+            mesclado.close()
+        for fluxo in fluxos:
+            fluxo.close()
+        if temporario is not None:
+            temporario.cleanup()
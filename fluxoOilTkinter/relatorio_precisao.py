@@ -0,0 +1,105 @@
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from calculo_em_blocos import CalculadoraBlocos, PrecisaoInsuficiente
+
+# Relatório de erro relativo do modo float32 em relação a float64 para
+# calcular_qo, calcular_eficiencia e calcular_Sp, com parâmetros sorteados
+# em faixas de campo usuais (unidades de campo; canhoneamento em polegadas).
+# O modo float32 recebe as colunas já em float32, como recomendado em
+# calculo_em_blocos.py; a referência usa as colunas originais em float64.
+
+
+def amostras_fluxo(n: int, rng) -> dict:
+    return {
+        "ko": rng.uniform(1, 1000, n), "h": rng.uniform(5, 200, n),
+        "pr": rng.uniform(1500, 6000, n), "pw": rng.uniform(200, 1400, n),
+        "uo": rng.uniform(0.3, 50, n), "Bo": rng.uniform(1.0, 2.0, n),
+        "re": rng.uniform(300, 3000, n), "rw": rng.uniform(0.25, 0.5, n),
+        "L": rng.uniform(1, 100, n), "A": rng.uniform(0.5, 20, n),
+        "rd": rng.uniform(0.6, 5, n), "kd": rng.uniform(1, 1000, n),
+    }
+
+
+def amostras_canhoneamento(n: int, rng, phasing: float) -> dict:
+    return {
+        "k": rng.uniform(1, 1000, n), "rw": rng.uniform(3, 6, n),
+        "lp": rng.uniform(6, 24, n), "rp": rng.uniform(0.1, 0.5, n),
+        "phasing": np.full(n, phasing), "h": rng.uniform(0.5, 4, n),
+        "rd": rng.uniform(6, 120, n),
+    }
+
+
+def erro_relativo(referencia: np.ndarray, obtido: np.ndarray) -> dict:
+    finitos = np.isfinite(referencia) & np.isfinite(obtido)
+    diferenca = np.abs(obtido[finitos].astype(np.float64) - referencia[finitos])
+    erro = diferenca / np.abs(referencia[finitos])
+    return {
+        "mediana": np.median(erro),
+        "p99": np.percentile(erro, 99),
+        "max": erro.max(),
+        "max_abs": diferenca.max(),
+        "nao_finitos": np.count_nonzero(~np.isfinite(obtido) & np.isfinite(referencia)),
+    }
+
+
+def em_float32(colunas: dict) -> dict:
+    return {nome: valores.astype(np.float32) for nome, valores in colunas.items()}
+
+
+def medir(funcao, colunas: dict):
+    inicio = time.perf_counter()
+    saida = funcao(colunas)
+    return saida, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Erro do modo float32 em relação a float64")
+    parser.add_argument("--pocos", type=int, default=1_000_000)
+    parser.add_argument("--bloco", type=int, default=65536)
+    args = parser.parse_args()
+    rng = np.random.default_rng(0)
+    c64 = CalculadoraBlocos("float64", args.bloco)
+    c32 = CalculadoraBlocos("float32", args.bloco)
+
+    casos = [
+        ("calcular_qo", "fluxo", "fluxo", amostras_fluxo(args.pocos, rng)),
+        ("calcular_eficiencia", "fluxo", "Eficiência(FE)", None),
+        ("calcular_Sp (0°)", "canhoneamento", "Sp", amostras_canhoneamento(args.pocos, rng, 0.0)),
+        ("calcular_Sp (180°)", "canhoneamento", "Sp", amostras_canhoneamento(args.pocos, rng, 180.0)),
+    ]
+    print(f"{args.pocos} poços por caso, blocos de {args.bloco}\n")
+    print(f"{'fórmula':22s} {'mediana':>10s} {'p99':>10s} {'máx.':>10s} {'máx. abs':>10s} {'overflow':>9s} {'t64 (s)':>8s} {'t32 (s)':>8s}")
+    for nome, etapa, chave, colunas in casos:
+        if colunas is not None:
+            colunas32 = em_float32(colunas)
+            # Os estouros de float32 aparecem na coluna "overflow"
+            with np.errstate(over="ignore"), warnings.catch_warnings():
+                warnings.simplefilter("ignore", PrecisaoInsuficiente)
+                ref, t64 = medir(getattr(c64, etapa), colunas)
+                obt, t32 = medir(getattr(c32, etapa), colunas32)
+        e = erro_relativo(ref[chave], obt[chave])
+        print(f"{nome:22s} {e['mediana']:10.2e} {e['p99']:10.2e} {e['max']:10.2e} {e['max_abs']:10.2e} "
+              f"{e['nao_finitos']:9d} {t64:8.3f} {t32:8.3f}")
+    bytes_64 = sum(a.nbytes for a in ref.values()) / args.pocos
+    bytes_32 = sum(a.nbytes for a in obt.values()) / args.pocos
+    print(f"\nSaídas de canhoneamento por poço: {bytes_64:.0f} B (float64) x {bytes_32:.0f} B (float32)")
+    # Mesma carga em float32, mas com colunas float64 (copiadas bloco a bloco)
+    c32_copia = CalculadoraBlocos("float32", args.bloco)
+    with np.errstate(over="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", PrecisaoInsuficiente)
+        c32_copia.fluxo(casos[0][3])
+        c32_copia.canhoneamento(colunas)
+
+    def megabytes(calculadora):
+        return sum(b.nbytes for b in calculadora._buffers.values()) / 1e6
+
+    print(f"Buffers de trabalho: {megabytes(c64):.1f} MB (float64), {megabytes(c32):.1f} MB (float32, "
+          f"colunas float32), {megabytes(c32_copia):.1f} MB (float32, colunas float64 copiadas)")
+
+
+if __name__ == "__main__":
+    main()
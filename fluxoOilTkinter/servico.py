@@ -0,0 +1,355 @@
+import argparse
+import asyncio
+import collections
+import json
+import time
+
+import numpy as np
+
+import unidades
+import validacao
+
+# Serviço HTTP/JSON local para os cálculos do aplicativo, sem dependências
+# externas. Requisições concorrentes de um mesmo endpoint são agrupadas em
+# micro-lotes e calculadas de uma só vez pelos núcleos vetorizados.
+#
+#   POST /fluxo           qo, skin, qo com S, deltaP e FE
+#   POST /produtividade   IP e II
+#   POST /canhoneamento   deltaP, Sp, Sx, Sdp e termos intermediários
+#   GET  /metricas        contadores, vazão e latências p50/p99
+#
+# Corpo: um registro ({"ko": 100, ..., "unidades": {...}}) ou
+# {"registros": [...], "unidades": {...}}; "unidades" é opcional nos dois.
+
+ESQUEMAS = {
+    "fluxo": unidades.COLUNAS_FLUXO,
+    "produtividade": unidades.COLUNAS_PRODUTIVIDADE,
+    "canhoneamento": unidades.COLUNAS_CANHONEAMENTO,
+}
+
+# Colunas que cada etapa realmente exige (psat é opcional em produtividade)
+COLUNAS_OBRIGATORIAS = {
+    "fluxo": tuple(unidades.COLUNAS_FLUXO),
+    "produtividade": ("q1", "Pe", "pwf"),
+    "canhoneamento": tuple(unidades.COLUNAS_CANHONEAMENTO),
+}
+
+MOTIVOS_HTTP = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+TAMANHO_MAX_CORPO = 1 << 20
+# Limite de cada linha da requisição/cabeçalho (o do StreamReader)
+TAMANHO_MAX_LINHA = 1 << 16
+
+
+class FilaCheia(Exception):
+    pass
+
+
+class RequisicaoInvalida(Exception):
+    def __init__(self, status: int, mensagem: str):
+        super().__init__(mensagem)
+        self.status = status
+
+
+class MicroLote:
+    """
+    Fila limitada de um endpoint. Um único consumidor junta o que chegar
+    em até `espera_max` segundos (ou `tamanho_max` linhas) e calcula tudo
+    numa só chamada vetorizada; com a fila cheia, novas requisições são
+    recusadas em vez de acumular memória.
+    """
+
+    def __init__(self, etapa: str, tamanho_max: int = 4096, espera_max: float = 0.002, capacidade: int = 1024):
+        self.etapa = etapa
+        self.colunas = COLUNAS_OBRIGATORIAS[etapa]
+        self.validar, self.calcular = validacao.ETAPAS[etapa]
+        self.tamanho_max = tamanho_max
+        self.espera_max = espera_max
+        self.fila = asyncio.Queue(maxsize=capacidade)
+        self.lotes = 0
+        self.linhas = 0
+        self._tarefa = None
+
+    def iniciar(self):
+        self._tarefa = asyncio.create_task(self._consumir())
+
+    async def parar(self):
+        if self._tarefa:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+
+    def enviar(self, colunas: dict, n: int) -> asyncio.Future:
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self.fila.put_nowait((colunas, n, futuro))
+        except asyncio.QueueFull:
+            raise FilaCheia(f"Fila de '{self.etapa}' cheia.") from None
+        return futuro
+
+    async def _consumir(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            pendentes = [await self.fila.get()]
+            linhas = pendentes[0][1]
+            limite = loop.time() + self.espera_max
+            while linhas < self.tamanho_max:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.fila.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+                pendentes.append(item)
+                linhas += item[1]
+            try:
+                self._processar(pendentes)
+            except Exception as e:
+                # Uma falha no lote não pode derrubar o consumidor: cada
+                # requisição do lote recebe o erro e a fila continua andando
+                for _, _, futuro in pendentes:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+
+    def _processar(self, pendentes: list):
+        bloco = {
+            nome: np.concatenate([colunas[nome] for colunas, _, _ in pendentes])
+            for nome in self.colunas
+        }
+        codigos = self.validar(bloco)
+        validos = codigos == 0
+        with np.errstate(all="ignore"):
+            resultados = self.calcular({nome: valores[validos] for nome, valores in bloco.items()})
+        # Posição de cada linha válida dentro dos vetores de resultado
+        posicao = np.cumsum(validos) - 1
+        # Linhas com algum resultado inf/NaN viram erro: JSON não representa
+        # esses valores
+        finitos = np.logical_and.reduce([np.isfinite(valores) for valores in resultados.values()])
+        estouros = np.flatnonzero(validos)[~finitos]
+        codigos[estouros] |= validacao.Motivo.RESULTADO_NAO_FINITO.value
+        validos[estouros] = False
+        listas = {nome: valores.tolist() for nome, valores in resultados.items()}
+        self.lotes += 1
+        self.linhas += codigos.shape[0]
+
+        inicio = 0
+        for _, n, futuro in pendentes:
+            saida = []
+            for i in range(inicio, inicio + n):
+                if validos[i]:
+                    j = posicao[i]
+                    saida.append({nome: valores[j] for nome, valores in listas.items()})
+                else:
+                    saida.append({"erro": validacao.descrever_motivos(int(codigos[i]))})
+            inicio += n
+            if not futuro.done():
+                futuro.set_result(saida)
+
+
+class Metricas:
+    def __init__(self, janela: int = 100_000):
+        self.inicio = time.perf_counter()
+        self.requisicoes = 0
+        self.recusadas = 0
+        self.latencias = collections.deque(maxlen=janela)
+
+    def registrar(self, segundos: float):
+        self.requisicoes += 1
+        self.latencias.append(segundos)
+
+    def resumo(self) -> dict:
+        decorrido = time.perf_counter() - self.inicio
+        resumo = {
+            "requisicoes": self.requisicoes,
+            "recusadas": self.recusadas,
+            "vazao_req_s": self.requisicoes / decorrido if decorrido else 0.0,
+        }
+        if self.latencias:
+            p50, p99 = np.percentile(np.fromiter(self.latencias, dtype=np.float64), [50, 99])
+            resumo["p50_ms"] = p50 * 1000
+            resumo["p99_ms"] = p99 * 1000
+        return resumo
+
+
+class ServicoCalculo:
+    def __init__(self, host: str = "127.0.0.1", porta: int = 8765, **opcoes_lote):
+        self.host = host
+        self.porta = porta
+        self.lotes = {etapa: MicroLote(etapa, **opcoes_lote) for etapa in ESQUEMAS}
+        self.metricas = Metricas()
+        self._servidor = None
+
+    async def iniciar(self):
+        for lote in self.lotes.values():
+            lote.iniciar()
+        self._servidor = await asyncio.start_server(
+            self._atender, self.host, self.porta, limit=TAMANHO_MAX_LINHA
+        )
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+
+    async def parar(self):
+        if self._servidor:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        for lote in self.lotes.values():
+            await lote.parar()
+
+    async def executar(self):
+        await self.iniciar()
+        print(f"Serviço de cálculo em http://{self.host}:{self.porta}")
+        async with self._servidor:
+            await self._servidor.serve_forever()
+
+    def _decodificar(self, etapa: str, corpo: bytes):
+        dados = json.loads(corpo or b"{}")
+        if isinstance(dados, dict) and "registros" in dados:
+            registros = dados["registros"]
+        else:
+            registros = [dados]
+        # "unidades" vale tanto para o lote quanto para um registro único
+        unidades_entrada = dados.get("unidades") if isinstance(dados, dict) else None
+        if unidades_entrada is not None and not isinstance(unidades_entrada, dict):
+            raise ValueError("'unidades' deve ser um objeto.")
+        if not isinstance(registros, list) or not registros:
+            raise ValueError("Informe ao menos um registro.")
+        conversor = unidades.ConversorLote(ESQUEMAS[etapa], unidades_entrada)
+        colunas = {}
+        for nome in COLUNAS_OBRIGATORIAS[etapa]:
+            try:
+                colunas[nome] = [float(r[nome]) for r in registros]
+            except KeyError:
+                raise ValueError(f"Campo '{nome}' ausente.") from None
+            except OverflowError:
+                raise ValueError(f"Valor de '{nome}' fora do intervalo de ponto flutuante.") from None
+        return conversor(colunas), len(registros)
+
+    async def _responder(self, metodo: str, caminho: str, corpo: bytes):
+        etapa = caminho.strip("/")
+        if caminho == "/metricas":
+            if metodo != "GET":
+                return 405, {"erro": "Use GET."}
+            resumo = self.metricas.resumo()
+            resumo["lotes"] = {e: {"lotes": l.lotes, "linhas": l.linhas, "fila": l.fila.qsize()} for e, l in self.lotes.items()}
+            return 200, resumo
+        if etapa not in self.lotes:
+            return 404, {"erro": f"Endpoint desconhecido: {caminho}"}
+        if metodo != "POST":
+            return 405, {"erro": "Use POST."}
+        try:
+            colunas, n = self._decodificar(etapa, corpo)
+        except (ValueError, TypeError, RecursionError) as e:
+            return 400, {"erro": str(e)}
+        try:
+            futuro = self.lotes[etapa].enviar(colunas, n)
+        except FilaCheia as e:
+            self.metricas.recusadas += 1
+            return 503, {"erro": str(e)}
+        try:
+            return 200, {"resultados": await futuro}
+        except Exception as e:
+            return 500, {"erro": f"Falha no cálculo do lote: {e}"}
+
+    @staticmethod
+    async def _escrever(escritor: asyncio.StreamWriter, status: int, resposta: dict, manter: bool):
+        try:
+            dados = json.dumps(resposta, allow_nan=False).encode()
+        except ValueError:
+            status, dados = 500, json.dumps({"erro": "Resposta com valor não finito."}).encode()
+        escritor.write(
+            f"HTTP/1.1 {status} {MOTIVOS_HTTP[status]}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(dados)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode() + dados
+        )
+        await escritor.drain()
+
+    @staticmethod
+    async def _ler_cabecalho(leitor: asyncio.StreamReader):
+        # Linha da requisição e cabeçalhos; None se a conexão foi fechada
+        linha = await leitor.readline()
+        if not linha:
+            return None
+        try:
+            metodo, caminho, _ = linha.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise RequisicaoInvalida(400, "Linha de requisição inválida.") from None
+        cabecalhos = {}
+        while True:
+            cabecalho = await leitor.readline()
+            if cabecalho in (b"\r\n", b"\n", b""):
+                break
+            nome, _, valor = cabecalho.decode("latin-1").partition(":")
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        try:
+            tamanho = int(cabecalhos.get("content-length", 0))
+        except ValueError:
+            raise RequisicaoInvalida(400, "Content-Length inválido.") from None
+        if tamanho < 0:
+            raise RequisicaoInvalida(400, "Content-Length inválido.")
+        if tamanho > TAMANHO_MAX_CORPO:
+            raise RequisicaoInvalida(413, "Corpo muito grande.")
+        return metodo, caminho, cabecalhos, tamanho
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    requisicao = await self._ler_cabecalho(leitor)
+                except RequisicaoInvalida as e:
+                    # Depois de um cabeçalho inválido não dá para saber onde
+                    # começa a próxima requisição: responde e fecha
+                    await self._escrever(escritor, e.status, {"erro": str(e)}, False)
+                    break
+                except ValueError:
+                    # readline() acima de TAMANHO_MAX_LINHA
+                    await self._escrever(escritor, 413, {"erro": "Linha de cabeçalho muito grande."}, False)
+                    break
+                if requisicao is None:
+                    break
+                inicio = time.perf_counter()
+                metodo, caminho, cabecalhos, tamanho = requisicao
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+                status, resposta = await self._responder(metodo, caminho, corpo)
+                manter = cabecalhos.get("connection", "").lower() != "close"
+                await self._escrever(escritor, status, resposta, manter)
+                if status == 200 and caminho != "/metricas":
+                    self.metricas.registrar(time.perf_counter() - inicio)
+                if not manter:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            escritor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço local de cálculos de completação")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--tamanho-lote", type=int, default=4096)
+    parser.add_argument("--espera-ms", type=float, default=2.0)
+    parser.add_argument("--capacidade", type=int, default=1024)
+    args = parser.parse_args()
+    servico = ServicoCalculo(
+        args.host, args.porta,
+        tamanho_max=args.tamanho_lote, espera_max=args.espera_ms / 1000, capacidade=args.capacidade,
+    )
+    try:
+        asyncio.run(servico.executar())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import functools
+
+import numpy as np
+
+# As constantes das fórmulas (0.00708, 0.00127, 0.472) assumem unidades de campo:
+# md, ft, psi, cp, bbl/STB e STB/d. A aba de Canhoneamento trabalha em polegadas.
+# Este módulo converte colunas inteiras para essas unidades na entrada do lote,
+# de forma que os cálculos nunca precisem conhecer a unidade de origem.
+
+# Fator multiplicativo de cada unidade para a unidade de referência da dimensão
+FATORES = {
+    "comprimento": {
+        "ft": 1.0,
+        "in": 1.0 / 12.0,
+        "m": 1.0 / 0.3048,
+        "cm": 1.0 / 30.48,
+        "mm": 1.0 / 304.8,
+    },
+    "area": {
+        "ft²": 1.0,
+        "in²": 1.0 / 144.0,
+        "m²": 1.0 / 0.09290304,
+        "cm²": 1.0 / 929.0304,
+    },
+    "pressao": {
+        "psi": 1.0,
+        "Pa": 1.0 / 6894.757293168361,
+        "kPa": 1.0 / 6.894757293168361,
+        "MPa": 1.0 / 0.006894757293168361,
+        "bar": 1.0 / 0.06894757293168361,
+        "atm": 14.695948775513449,
+        "kgf/cm²": 14.223343307119563,
+    },
+    "permeabilidade": {
+        "md": 1.0,
+        "D": 1000.0,
+        "m²": 1.0 / 9.869233e-16,
+        "µm²": 1.0 / 9.869233e-4,
+    },
+    "viscosidade": {
+        "cp": 1.0,
+        "mPa.s": 1.0,
+        "Pa.s": 1000.0,
+        "P": 100.0,
+    },
+    "vazao": {
+        "STB/d": 1.0,
+        "m³/d": 6.289810770432105,
+        "m³/h": 24.0 * 6.289810770432105,
+    },
+    "fator_volume": {
+        "bbl/STB": 1.0,
+        "m³/m³": 1.0,
+    },
+    "angulo": {
+        "grau": 1.0,
+    },
+}
+
+# Dimensão e unidade esperada pelas fórmulas para cada coluna de entrada
+COLUNAS_FLUXO = {
+    "ko": ("permeabilidade", "md"),
+    "h": ("comprimento", "ft"),
+    "pr": ("pressao", "psi"),
+    "pw": ("pressao", "psi"),
+    "uo": ("viscosidade", "cp"),
+    "Bo": ("fator_volume", "bbl/STB"),
+    "re": ("comprimento", "ft"),
+    "rw": ("comprimento", "ft"),
+    "L": ("comprimento", "ft"),
+    "A": ("area", "ft²"),
+    "rd": ("comprimento", "ft"),
+    "kd": ("permeabilidade", "md"),
+}
+
+COLUNAS_PRODUTIVIDADE = {
+    "q1": ("vazao", "STB/d"),
+    "Pe": ("pressao", "psi"),
+    "pwf": ("pressao", "psi"),
+    "psat": ("pressao", "psi"),
+}
+
+COLUNAS_CANHONEAMENTO = {
+    "k": ("permeabilidade", "md"),
+    "rw": ("comprimento", "in"),
+    "lp": ("comprimento", "in"),
+    "rp": ("comprimento", "in"),
+    "phasing": ("angulo", "grau"),
+    "h": ("comprimento", "in"),
+    "rd": ("comprimento", "in"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def fator_conversao(dimensao: str, origem: str, destino: str) -> float:
+    if dimensao not in FATORES:
+        raise ValueError(f"Dimensão desconhecida: '{dimensao}'.")
+    unidades = FATORES[dimensao]
+    for unidade in (origem, destino):
+        if unidade not in unidades:
+            raise ValueError(
+                f"Unidade '{unidade}' não é de {dimensao}. "
+                f"Unidades aceitas: {', '.join(unidades)}."
+            )
+    return unidades[origem] / unidades[destino]
+
+
+def _aplicar_fator(valores, fator: float) -> np.ndarray:
+    # Sempre devolve um array novo (nunca um alias da entrada, mesmo com fator
+    # 1.0) e mantém colunas float32/float64; as demais viram float64
+    coluna = np.asarray(valores)
+    tipo = coluna.dtype if np.issubdtype(coluna.dtype, np.floating) else np.float64
+    convertida = np.array(coluna, dtype=tipo, copy=True)
+    if fator != 1.0:
+        convertida *= fator
+    return convertida
+
+
+def converter_coluna(valores, dimensao: str, origem: str, destino: str) -> np.ndarray:
+    # A validação acontece uma única vez por coluna, no cálculo (em cache) do fator
+    return _aplicar_fator(valores, fator_conversao(dimensao, origem, destino))
+
+
+class ConversorLote:
+    """
+    Converte lotes de colunas para as unidades de campo das fórmulas.
+    As unidades são validadas e os fatores calculados na construção;
+    cada chamada faz apenas uma cópia e uma multiplicação vetorizada por
+    coluna. O resultado nunca compartilha memória com a entrada, e colunas
+    float32 continuam float32.
+    """
+
+    def __init__(self, esquema: dict, unidades: dict | None = None):
+        unidades = unidades or {}
+        desconhecidas = set(unidades) - set(esquema)
+        if desconhecidas:
+            raise ValueError(f"Colunas desconhecidas: {', '.join(sorted(desconhecidas))}.")
+        self.esquema = esquema
+        self.fatores = {}
+        for nome, (dimensao, destino) in esquema.items():
+            origem = unidades.get(nome, destino)
+            self.fatores[nome] = fator_conversao(dimensao, origem, destino)
+
+    def __call__(self, colunas: dict) -> dict:
+        convertidas = {}
+        for nome, valores in colunas.items():
+            if nome not in self.fatores:
+                raise ValueError(f"Coluna '{nome}' não pertence ao esquema.")
+            convertidas[nome] = _aplicar_fator(valores, self.fatores[nome])
+        return convertidas
+
+
+def converter_lote(colunas: dict, unidades: dict, esquema: dict = COLUNAS_FLUXO) -> dict:
+    return ConversorLote(esquema, unidades)(colunas)
@@ -0,0 +1,131 @@
+import enum
+
+import numpy as np
+
+import calculos_vetorizados as cv
+
+# Triagem vetorizada das pré-condições físicas. Em vez de deixar cada poço
+# levantar ValueError dentro de calcular_skin, calcular_ip ou calcular_Sp,
+# todas as condições são avaliadas de uma vez sobre o bloco; as linhas
+# inválidas vão para o fluxo de rejeitados com os motivos codificados em bits.
+
+
+class Motivo(enum.IntFlag):
+    VALOR_NAO_FINITO = enum.auto()
+    RAIO_NAO_POSITIVO = enum.auto()
+    RE_MENOR_IGUAL_RW = enum.auto()
+    RD_MENOR_RW = enum.auto()
+    KD_ZERO = enum.auto()
+    DIVISOR_ZERO = enum.auto()
+    PWF_IGUAL_PE = enum.auto()
+    PHASING_INVALIDO = enum.auto()
+    ALTURA_NAO_POSITIVA = enum.auto()
+    PERMEABILIDADE_NAO_POSITIVA = enum.auto()
+    RPD_NAO_POSITIVO = enum.auto()
+    # Entradas válidas, mas o resultado estourou (inf/NaN) no cálculo
+    RESULTADO_NAO_FINITO = enum.auto()
+
+
+def descrever_motivos(codigo: int) -> list:
+    return [m.name for m in Motivo if codigo & m]
+
+
+def _marcar(codigos, condicao, motivo):
+    codigos[condicao] |= motivo.value
+
+
+def _nao_finitos(colunas: dict, tamanho: int) -> np.ndarray:
+    ruins = np.zeros(tamanho, dtype=bool)
+    for coluna in colunas.values():
+        ruins |= ~np.isfinite(coluna)
+    return ruins
+
+
+def _colunas_array(colunas: dict, nomes) -> dict:
+    faltando = [n for n in nomes if n not in colunas]
+    if faltando:
+        raise ValueError(f"Colunas ausentes: {', '.join(faltando)}.")
+    arrays = {n: np.asarray(colunas[n], dtype=np.float64) for n in nomes}
+    tamanhos = {a.shape for a in arrays.values()}
+    if len(tamanhos) != 1:
+        raise ValueError("Todas as colunas do bloco devem ter o mesmo tamanho.")
+    return arrays
+
+
+def validar_fluxo(colunas: dict) -> np.ndarray:
+    c = _colunas_array(colunas, ("ko", "h", "pr", "pw", "uo", "Bo", "re", "rw", "L", "A", "rd", "kd"))
+    n = c["ko"].shape[0]
+    codigos = np.zeros(n, dtype=np.uint32)
+    _marcar(codigos, _nao_finitos(c, n), Motivo.VALOR_NAO_FINITO)
+    _marcar(codigos, c["rw"] <= 0, Motivo.RAIO_NAO_POSITIVO)
+    _marcar(codigos, c["re"] <= c["rw"], Motivo.RE_MENOR_IGUAL_RW)
+    _marcar(codigos, c["rd"] < c["rw"], Motivo.RD_MENOR_RW)
+    _marcar(codigos, c["kd"] == 0, Motivo.KD_ZERO)
+    with np.errstate(all="ignore"):
+        ln_part = np.log(0.472 * c["re"] / c["rw"])
+        skin = cv.calcular_skin(c["ko"], c["kd"], c["rd"], c["rw"])
+        divisor_zero = (
+            (c["uo"] * c["Bo"] * ln_part == 0)
+            | (ln_part + skin == 0)
+            | (c["uo"] * c["Bo"] * (ln_part + skin) == 0)
+            | (0.00127 * c["A"] * c["ko"] == 0)
+        )
+    _marcar(codigos, divisor_zero, Motivo.DIVISOR_ZERO)
+    return codigos
+
+
+def validar_produtividade(colunas: dict) -> np.ndarray:
+    c = _colunas_array(colunas, ("q1", "Pe", "pwf"))
+    n = c["q1"].shape[0]
+    codigos = np.zeros(n, dtype=np.uint32)
+    _marcar(codigos, _nao_finitos(c, n), Motivo.VALOR_NAO_FINITO)
+    _marcar(codigos, c["pwf"] == c["Pe"], Motivo.PWF_IGUAL_PE)
+    return codigos
+
+
+def validar_canhoneamento(colunas: dict) -> np.ndarray:
+    c = _colunas_array(colunas, ("k", "rw", "lp", "rp", "phasing", "h", "rd"))
+    n = c["k"].shape[0]
+    codigos = np.zeros(n, dtype=np.uint32)
+    _marcar(codigos, _nao_finitos(c, n), Motivo.VALOR_NAO_FINITO)
+    _marcar(codigos, (c["rw"] <= 0) | (c["lp"] <= 0), Motivo.RAIO_NAO_POSITIVO)
+    _marcar(codigos, (c["phasing"] != 0) & (c["phasing"] != 180), Motivo.PHASING_INVALIDO)
+    _marcar(codigos, c["h"] <= 0, Motivo.ALTURA_NAO_POSITIVA)
+    _marcar(codigos, c["k"] <= 0, Motivo.PERMEABILIDADE_NAO_POSITIVA)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rpd = cv.calcular_rpd(c["rp"], c["h"])
+    _marcar(codigos, ~(rpd > 0), Motivo.RPD_NAO_POSITIVO)
+    return codigos
+
+
+def separar(colunas: dict, codigos: np.ndarray, inicio: int = 0):
+    # Divide o bloco em colunas limpas e no registro de rejeitados
+    validos = codigos == 0
+    limpos = {nome: np.asarray(valores)[validos] for nome, valores in colunas.items()}
+    indices = np.arange(inicio, inicio + codigos.shape[0])
+    rejeitados = {"indice": indices[~validos], "motivo": codigos[~validos]}
+    return indices[validos], limpos, rejeitados
+
+
+# Pares (validação, núcleo de cálculo) para cada aba do aplicativo
+ETAPAS = {
+    "fluxo": (validar_fluxo, cv.calcular_fluxo),
+    "produtividade": (validar_produtividade, cv.calcular_produtividade),
+    "canhoneamento": (validar_canhoneamento, cv.calcular_canhoneamento),
+}
+
+
+def triagem(blocos, etapa: str = "fluxo"):
+    """
+    Processa um fluxo de blocos (dicts de colunas). Para cada bloco, produz
+    (indices_validos, resultados, rejeitados), com índices globais ao fluxo.
+    Os núcleos só recebem linhas que passaram em todas as pré-condições.
+    """
+    validar, calcular = ETAPAS[etapa]
+    inicio = 0
+    for bloco in blocos:
+        codigos = validar(bloco)
+        indices, limpos, rejeitados = separar(bloco, codigos, inicio)
+        resultados = calcular(limpos)
+        inicio += codigos.shape[0]
+        yield indices, resultados, rejeitados